@@ -9,44 +9,92 @@ Email:   fras2560@mylaurier.ca
 Version: 2014-10-07
 -------------------------------------------------------
 """
-from solver.graph import Graph
+from solver.graph import Graph, LADDER, GUESS
+from solver.dlx import DancingLinks
+from solver.reader import read_puzzles, parse_line, to_line
 import logging
+import heapq
+
+# the outcomes of a search
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"
+BUDGET_EXCEEDED = "budget exceeded"
+# the engines a search can use
+GRAPH = "graph"
+DLX = "dlx"
+ENGINES = (GRAPH, DLX)
 
 class Solver():
-    def __init__(self, logger=None):
-        self.n = 9
+    def __init__(self, logger=None, engine=GRAPH, trace=None, stats=None,
+                 tiers=None, n=9, box=None):
+        if engine not in ENGINES:
+            raise Exception("Unknown engine: %s" % engine)
+        self.engine = engine
+        # the size of the board and the shape of its boxes
+        # (see Graph), 16 has 4 by 4 boxes and 6 has 2 by 3 boxes
+        self.n = n
         if logger is None:
             logging.basicConfig(level=logging.INFO,
                             format='%(asctime)s %(message)s')
             logger = logging.getLogger(__name__)
         self.logger = logger
-        self.graph = Graph(9, logger)
+        self.graph = Graph(n, logger, box)
+        # a sink for the events of the graph (see trace)
+        self.graph.trace = trace
+        # a Stats the moves, propagation and guesses are recorded to
+        self.stats = stats
+        self.graph.stats = stats
+        # the techniques propagate plays once the nodes are done
+        # (see Graph.play_tiers), None for the graph's default
+        if tiers is not None:
+            self.graph.tiers = list(tiers)
+        # the number of guesses made by the last search
+        self.guesses = 0
+        # the hardest technique the last rate needed and the number
+        # of steps each technique made
+        self.hardest = None
+        self.steps = {}
 
     def load(self, file):
         '''
-        loads the sudoku puzzle from a file
+        loads the first sudoku puzzle from a file
         Parameters:
-            file: the file path
+            file: the file path, "-" for stdin, an open file or lines
+                  (see reader.read_puzzles)
         Returns:
-            none
+            True if loaded
         Raised:
-            Exception if can't be opened
-        '''
-        loaded = False
-        with open(file) as f:
-            loaded = True
-            row = 0
-            for line in f:
-                colors = line.replace("\n","").replace(" ","").split(",")
-                column = 0
-                for color in colors:
-                    if self.is_int(color):
-                        self.graph.set_node_color(row, column, int(color))
-                    column += 1
-                row += 1
-        if not loaded:
-            raise Exception("Did not load file")
-        return loaded
+            Exception if can't be opened or has no puzzle
+        '''
+        for puzzle in read_puzzles(file, self.n):
+            self.load_list(puzzle)
+            return True
+        raise Exception("Did not load file")
+
+    def load_list(self, grid):
+        '''
+        loads the sudoku puzzle from a list of rows
+        Parameters:
+            grid: the rows of colors, ' ' or None for no color
+                  (the same format as Graph.to_list) (list)
+        Returns:
+            none
+        '''
+        for row, colors in enumerate(grid):
+            for column, color in enumerate(colors):
+                if color is not None and color != " ":
+                    self.graph.set_node_color(row, column, color)
+
+    def reset(self):
+        '''
+        clears the loaded puzzle so the solver can be reused
+        Parameters:
+            None
+        Returns:
+            None
+        '''
+        self.graph.reset()
+        self.guesses = 0
 
     def is_int(self, number):
         '''
@@ -68,40 +116,402 @@ class Solver():
 
     def solve(self):
         '''
-        a function that loops until it solves the puzzle or does
-        know how to process on next move
+        a function that propagates moves until it solves the puzzle or
+        does not know how to process the next move
         Parameters:
             None
         Returns:
             True if finished
             False if ran out of moves
         '''
-        done = False
-        iterations = -1
-        while not done:
-            iterations += 1
-            self.logger.info("-----------------------------")
-            self.logger.info("Iteration: %d" % iterations)
-            self.logger.info("-----------------------------")
-            done = True
-            # look at each node
-            for row in range(0, self.n):
-                for column in range(0, self.n):
-                    move = self.graph.make_move(row, column)
-                    if move:
-                        if not self.graph.validate():
-                            self.logger.error("Wrong Move was played")
-                        else:
-                            print()
-                            self.graph.output()
-                            print()
-                            done = False
-            if iterations > 10:
+        solved = self.propagate()
+        print()
+        self.graph.output()
+        print()
+        return solved
+
+    def propagate(self):
+        '''
+        a function that makes moves until none is left
+        only the nodes whose palette (or a neighbor's palette) changed
+        are looked at again, the nodes with the fewest colors first,
+        a color left with one node in a unit is placed right away and
+        the tiers of the graph (subsets, fish) are played when nothing
+        is left
+        Parameters:
+            None
+        Returns:
+            True if the puzzle is solved
+            False otherwise
+        '''
+        graph = self.graph
+        peers = graph.topology.peers
+        queue = []
+        # the color count each node is queued with, 0 if not queued
+        queued = [0] * len(peers)
+        graph.pop_changed()
+        for node_id in graph.get_nodes():
+            count = graph.get_color_count(node_id)
+            if count > 0:
+                queue.append((count, node_id))
+                queued[node_id] = count
+        heapq.heapify(queue)
+        stats = self.stats
+        if stats is not None:
+            stats.sweeps += 1
+            stats.record_queue(len(queue))
+        moves = 0
+        while True:
+            # the hidden singles left by the last move are played first
+            if graph.play_hidden_singles():
+                move = True
+            elif queue:
+                count, node_id = heapq.heappop(queue)
+                if (queued[node_id] != count or
+                        count != graph.get_color_count(node_id)):
+                    # already looked at or a stale entry
+                    continue
+                queued[node_id] = 0
+                row, column = graph.get_row_column(node_id)
+                move = graph.make_move(row, column)
+            elif graph.play_tiers():
+                # the tiers are only played once the nodes are done
+                move = True
+            else:
                 break
-        return
+            if move:
+                moves += 1
+                if not graph.validate():
+                    self.logger.error("Wrong Move was played")
+                # look again at the changed nodes and their neighbors
+                # a node already queued with its count is not pushed again
+                changed = graph.pop_changed()
+                touched = set(changed)
+                for node_id in changed:
+                    touched.update(peers[node_id])
+                for x in touched:
+                    count = graph.get_color_count(x)
+                    if count > 0 and queued[x] != count:
+                        heapq.heappush(queue, (count, x))
+                        queued[x] = count
+                if stats is not None:
+                    stats.record_queue(len(queue))
+        self.logger.debug("Propagation stopped after %d moves", moves)
+        return graph.is_solved()
+
+    def search(self, budget=None, engine=None):
+        '''
+        a function that solves the puzzle by guessing when the moves
+        run out
+        the graph engine guesses the node with the fewest colors and
+        propagates the moves again after every guess, the dlx engine
+        solves the exact cover of the board with dancing links
+        Parameters:
+            budget: the most guesses to make, None for no limit (int)
+            engine: GRAPH or DLX, None for the solver's engine (str)
+        Returns:
+            SOLVED if the puzzle was solved
+            UNSOLVABLE if the puzzle has no solution
+            BUDGET_EXCEEDED if the budget ran out first
+        '''
+        if engine is None:
+            engine = self.engine
+        elif engine not in ENGINES:
+            raise Exception("Unknown engine: %s" % engine)
+        self.guesses = 0
+        if not self.graph.validate():
+            return UNSOLVABLE
+        if engine == DLX:
+            status = self._search_dlx(budget)
+        else:
+            try:
+                status = self._search(budget)
+            finally:
+                self.graph.stop_trail()
+        if self.stats is not None:
+            self.stats.guesses += self.guesses
+        self.logger.debug("Search %s after %d guesses", status,
+                          self.guesses)
+        return status
+
+    def rate(self):
+        '''
+        a function that solves the puzzle playing at each step the
+        cheapest technique of the ladder (see graph.LADDER) that makes
+        a move, a node is guessed once no technique moves and the
+        ladder is played again after every guess
+        the hardest technique and the steps of each technique on the
+        way to the solution are kept in hardest and steps, the steps
+        of the branches that failed are not kept but their guesses are
+        Parameters:
+            None
+        Returns:
+            grade: the grade of the hardest technique needed or None if
+                   the puzzle has no solution (float)
+        '''
+        graph = self.graph
+        self.hardest = None
+        self.steps = {}
+        self.guesses = 0
+        if not graph.validate():
+            return None
+        ladder = [technique for technique, __ in LADDER if technique != GUESS]
+        try:
+            solved = self._rate(ladder)
+        finally:
+            graph.stop_trail()
+        if not solved:
+            return None
+        if self.guesses > 0:
+            self.steps[GUESS] = self.guesses
+        if len(self.steps) == 0:
+            # a full grid needs no technique
+            return 0.0
+        grades = dict(LADDER)
+        self.hardest = max(self.steps, key=grades.get)
+        return grades[self.hardest]
+
+    def _rate(self, ladder):
+        '''
+        a function that does one level of the rating (see rate)
+        Parameters:
+            ladder: the techniques to play from cheapest to hardest (list)
+        Returns:
+            True if the puzzle was solved
+            False otherwise
+        '''
+        graph = self.graph
+        while graph.validate() and not graph.is_solved():
+            for technique in ladder:
+                if graph.play_technique(technique):
+                    self.steps[technique] = self.steps.get(technique, 0) + 1
+                    break
+            else:
+                break
+        if not graph.validate():
+            return False
+        if graph.is_solved():
+            return True
+        node_id = graph.get_fewest_colors_node()
+        row, column = graph.get_row_column(node_id)
+        # the guesses and their steps are undone when they fail
+        mark = graph.mark()
+        steps = dict(self.steps)
+        for color in graph.get_available_colors(row, column):
+            self.guesses += 1
+            graph.set_node_color(row, column, color)
+            if self._rate(ladder):
+                return True
+            graph.undo(mark)
+            self.steps = dict(steps)
+        return False
+
+    def count_solutions(self, limit=2):
+        '''
+        a function that counts the solutions of the puzzle, stopping
+        as soon as limit are found, the graph engine propagates the
+        moves after every guess and undoes them with the trail of the
+        graph, the dlx engine counts the exact covers
+        the loaded puzzle is left as it was
+        Parameters:
+            limit: the most solutions to count (int)
+        Returns:
+            count: the number of solutions, at most limit (int)
+        Raises:
+            Exception: if limit is less than 1
+        '''
+        if limit < 1:
+            raise Exception("Solution limit must be at least 1: %d" % limit)
+        graph = self.graph
+        self.guesses = 0
+        count = 0
+        if not graph.validate():
+            return count
+        if self.engine == DLX:
+            links = DancingLinks(graph)
+            count = len(links.solve(limit=limit))
+            self.guesses = links.guesses
+        else:
+            mark = graph.mark()
+            solutions = self._solutions()
+            try:
+                for __ in solutions:
+                    count += 1
+                    if count >= limit:
+                        break
+            finally:
+                solutions.close()
+                graph.undo(mark)
+                graph.stop_trail()
+        if self.stats is not None:
+            self.stats.guesses += self.guesses
+        return count
+
+    def iter_solutions(self, line=False):
+        '''
+        a generator of the solutions of the puzzle found one at a time
+        by the graph search, only the current branch is kept so the
+        solutions of a sparse board can be walked without storing them
+        stopping early (or closing the generator) leaves the loaded
+        puzzle as it was
+        Parameters:
+            line: True to yield the one line format (see
+                  reader.to_line), False for lists of rows (boolean)
+        Returns:
+            : a generator of the solutions, each in the Graph.to_list
+              format or a str
+        '''
+        graph = self.graph
+        self.guesses = 0
+        if not graph.validate():
+            return
+        mark = graph.mark()
+        solutions = self._solutions()
+        try:
+            for __ in solutions:
+                grid = graph.to_list()
+                if line:
+                    yield to_line(grid)
+                else:
+                    yield grid
+        finally:
+            solutions.close()
+            graph.undo(mark)
+            graph.stop_trail()
+            if self.stats is not None:
+                self.stats.guesses += self.guesses
+
+    def is_unique(self):
+        '''
+        a function that checks the puzzle has exactly one solution,
+        the search stops at the second solution
+        Parameters:
+            None
+        Returns:
+            True if the puzzle has one solution
+            False otherwise
+        '''
+        return self.count_solutions(limit=2) == 1
+
+    def _search_dlx(self, budget):
+        '''
+        a function that solves the puzzle with dancing links
+        Parameters:
+            budget: the most rows to try, None for no limit (int)
+        Returns:
+            the status of the search (see search)
+        '''
+        graph = self.graph
+        links = DancingLinks(graph)
+        solutions = links.solve(limit=1, budget=budget)
+        self.guesses = links.guesses
+        if len(solutions) == 0:
+            if links.exceeded:
+                return BUDGET_EXCEEDED
+            return UNSOLVABLE
+        for node_id, color in enumerate(solutions[0]):
+            row, column = graph.get_row_column(node_id)
+            if graph.get_node_color(row, column) is None:
+                graph.set_node_color(row, column, color)
+        return SOLVED
+
+    def _search(self, budget):
+        '''
+        a function that does one level of the search
+        Parameters:
+            budget: the most guesses to make, None for no limit (int)
+        Returns:
+            the status of the search (see search)
+        '''
+        graph = self.graph
+        if self.propagate():
+            return SOLVED
+        node_id = graph.get_fewest_colors_node()
+        row, column = graph.get_row_column(node_id)
+        colors = graph.get_available_colors(row, column)
+        if len(colors) == 0:
+            return UNSOLVABLE
+        # the guesses are undone with the trail of the graph
+        mark = graph.mark()
+        for color in colors:
+            if budget is not None and self.guesses >= budget:
+                return BUDGET_EXCEEDED
+            self.guesses += 1
+            graph.set_node_color(row, column, color)
+            status = self._search(budget)
+            if status != UNSOLVABLE:
+                return status
+            graph.undo(mark)
+        return UNSOLVABLE
+
+    def _solutions(self):
+        '''
+        a generator that searches every branch of the puzzle, the
+        graph holds a solution each time one is yielded and the
+        branches are undone with the trail of the graph
+        Parameters:
+            None
+        Returns:
+            : a generator that yields None for each solution
+        '''
+        graph = self.graph
+        solved = self.propagate()
+        if not graph.validate():
+            return
+        if solved:
+            yield
+            return
+        node_id = graph.get_fewest_colors_node()
+        row, column = graph.get_row_column(node_id)
+        mark = graph.mark()
+        for color in graph.get_available_colors(row, column):
+            self.guesses += 1
+            graph.set_node_color(row, column, color)
+            for __ in self._solutions():
+                yield
+            graph.undo(mark)
 
 import unittest
 import os
+import time
+import itertools
+import tracemalloc
+from solver.trace import ListSink, PLACE
+from solver.stats import Stats
+from solver.graph import NAKED_SUBSET, OBVIOUS
+
+# a puzzle with 21 clues that needs guessing (1-9 and . for blanks)
+HARD = ("8........"
+        "..36....."
+        ".7..9.2.."
+        ".5...7..."
+        "....457.."
+        "...1...3."
+        "..1....68"
+        "..85...1."
+        ".9....4..")
+
+# the solution of HARD with a rectangle of four nodes over two boxes
+# left blank, its two colors can be swapped so it has two solutions
+TWO_SOLUTIONS = ("81.75.649"
+                 "94.68.175"
+                 "675491283"
+                 "154237896"
+                 "369845721"
+                 "287169534"
+                 "521974368"
+                 "438526917"
+                 "796318452")
+
+# the most seconds a 25 by 25 board of the benchmarks may take
+LARGE_BUDGET = 2.0
+
+def load_string(solver, puzzle):
+    '''
+    loads a puzzle given in the one line format into the solver
+    '''
+    solver.load_list(parse_line(puzzle))
+
 class Test(unittest.TestCase):
     def setUp(self):
         logging.basicConfig(filename="testing.log", level=logging.DEBUG,
@@ -140,6 +550,28 @@ class Test(unittest.TestCase):
                 ]
         self.assertEqual(expect, result)
 
+    def testLoadList(self):
+        self.solver.load(self.test_files[0])
+        grid = self.solver.graph.to_list()
+        solver = Solver(logger=self.logger)
+        solver.load_list(grid)
+        self.assertEqual(solver.graph.to_list(), grid)
+        solver.reset()
+        self.assertEqual(solver.graph.to_list(), [[' '] * 9] * 9)
+        solver.load_list([[None, 3]])
+        self.assertEqual(solver.graph.get_node_color(0, 1), 3)
+
+    def testLoadLines(self):
+        self.solver.load(["3, ,6,1,7,4,5, ,", " , ,4, ,5, ,1,3,7"] +
+                         [",,,,,,,,"] * 7)
+        result = self.solver.graph.to_list()
+        self.assertEqual(result[1], [' ', ' ', 4, ' ', 5, ' ', 1, 3, 7])
+        self.assertEqual(result[2], [' '] * 9)
+        with self.assertRaises(Exception):
+            Solver(logger=self.logger).load([])
+        with self.assertRaises(Exception):
+            Solver(logger=self.logger).load(["3, ,6,1,7,4,5, ,"])
+
     def testLoadColors(self):
         self.solver.load(self.test_files[0])
         r = self.solver.graph.get_available_colors(1, 0)
@@ -151,7 +583,7 @@ class Test(unittest.TestCase):
 
     def testSolve(self):
         self.solver.load(self.test_files[0])
-        self.solver.solve()
+        self.assertEqual(self.solver.solve(), True)
         valid = self.solver.graph.validate()
         self.assertEqual(valid, True)
         result = self.solver.graph.to_list()
@@ -188,6 +620,236 @@ class Test(unittest.TestCase):
                 if column != ' ':
                     self.assertEqual(expect[i1][i2], column)
 
+    def testSolveStuck(self):
+        # only the two corners of an otherwise empty board are set
+        self.solver.graph.set_node_color(0, 0, 0)
+        self.solver.graph.set_node_color(8, 8, 1)
+        self.assertEqual(self.solver.solve(), False)
+        self.assertEqual(self.solver.graph.validate(), True)
+
+    def testSearch(self):
+        # a puzzle the moves alone can not finish
+        load_string(self.solver, HARD)
+        self.assertEqual(self.solver.search(), SOLVED)
+        self.assertEqual(self.solver.graph.validate(), True)
+        self.assertEqual(self.solver.graph.is_solved(), True)
+        self.assertEqual(self.solver.guesses > 0, True)
+
+    def testSearchEmpty(self):
+        self.assertEqual(self.solver.search(), SOLVED)
+        self.assertEqual(self.solver.graph.validate(), True)
+
+    def testSearchUnsolvable(self):
+        # the top left node needs color 0 which its column already has
+        load_string(self.solver, ".23456789" + "." * 36 +
+                                 "1........" + "." * 27)
+        self.assertEqual(self.solver.graph.validate(), True)
+        self.assertEqual(self.solver.search(), UNSOLVABLE)
+
+    def testSearchInvalid(self):
+        self.solver.graph.set_node_color(0, 0, 0)
+        self.solver.graph.set_node_color(0, 8, 0)
+        self.assertEqual(self.solver.search(), UNSOLVABLE)
+
+    def testSearchBudget(self):
+        load_string(self.solver, HARD)
+        self.assertEqual(self.solver.search(budget=1), BUDGET_EXCEEDED)
+        self.assertEqual(self.solver.guesses, 1)
+
+    def testSearchDlx(self):
+        solver = Solver(logger=self.logger, engine=DLX)
+        load_string(solver, HARD)
+        self.assertEqual(solver.search(), SOLVED)
+        self.assertEqual(solver.graph.validate(), True)
+        self.assertEqual(solver.graph.is_solved(), True)
+        load_string(self.solver, HARD)
+        self.assertEqual(self.solver.search(engine=DLX), SOLVED)
+        self.assertEqual(self.solver.graph.to_list(), solver.graph.to_list())
+
+    def testSearchDlxUnsolvable(self):
+        load_string(self.solver, ".23456789" + "." * 36 +
+                                 "1........" + "." * 27)
+        self.assertEqual(self.solver.search(engine=DLX), UNSOLVABLE)
+        self.assertEqual(self.solver.search(budget=0, engine=DLX),
+                         UNSOLVABLE)
+
+    def testSearchDlxBudget(self):
+        self.assertEqual(self.solver.search(budget=3, engine=DLX),
+                         BUDGET_EXCEEDED)
+
+    def testUnknownEngine(self):
+        with self.assertRaises(Exception):
+            Solver(logger=self.logger, engine="xx")
+        with self.assertRaises(Exception):
+            self.solver.search(engine="xx")
+
+    def testTrace(self):
+        sink = ListSink()
+        solver = Solver(logger=self.logger, trace=sink)
+        solver.load(self.test_files[0])
+        solver.propagate()
+        places = [event for event in sink.events if event.kind == PLACE]
+        # 47 given colors and 34 moves
+        self.assertEqual(len(places), 81)
+        self.assertEqual(places[0].technique, None)
+        self.assertEqual(places[-1].technique is not None, True)
+
+    def testTiers(self):
+        stats = Stats()
+        plain = Solver(logger=self.logger, stats=stats, tiers=[])
+        self.assertEqual(plain.graph.tiers, [])
+        load_string(plain, HARD)
+        self.assertEqual(plain.propagate(), False)
+        self.assertEqual(NAKED_SUBSET in stats.techniques, False)
+        self.solver.stats = self.solver.graph.stats = stats
+        load_string(self.solver, HARD)
+        self.assertEqual(self.solver.propagate(), False)
+        self.assertEqual(stats.techniques[NAKED_SUBSET]["invocations"] > 0,
+                         True)
+        self.assertEqual("x-wing" in stats.techniques, True)
+
+    def testStats(self):
+        stats = Stats()
+        solver = Solver(logger=self.logger, stats=stats)
+        load_string(solver, HARD)
+        self.assertEqual(solver.search(), SOLVED)
+        self.assertEqual(stats.guesses, solver.guesses)
+        self.assertEqual(stats.sweeps > solver.guesses, True)
+        self.assertEqual(stats.longest_queue > 0, True)
+        placements = 0
+        for counters in stats.techniques.values():
+            self.assertEqual(counters["invocations"] >=
+                             counters["successes"], True)
+            placements += counters["placements"]
+        self.assertEqual(placements > 0, True)
+        self.assertEqual(Stats.from_json(stats.to_json()).to_dict(),
+                         stats.to_dict())
+
+    def testBoxShapes(self):
+        for box in [(2, 3), (3, 2)]:
+            solver = Solver(logger=self.logger, n=6, box=box)
+            self.assertEqual(solver.search(), SOLVED)
+            self.assertEqual(solver.graph.validate(audit=True), True)
+            grid = solver.graph.to_list()
+            rows, columns = box
+            for row in range(0, 6, rows):
+                for column in range(0, 6, columns):
+                    colors = set(grid[r][c]
+                                 for r in range(row, row + rows)
+                                 for c in range(column, column + columns))
+                    self.assertEqual(colors, set(range(6)))
+
+    def testLargeBoards(self):
+        for name, n in [("sixteen.txt", 16), ("twentyfive.txt", 25)]:
+            path = os.path.join(self.test_directory, "benchmarks", name)
+            puzzle = next(read_puzzles(path, n))
+            solver = Solver(logger=self.logger, n=n)
+            solver.load_list(puzzle)
+            start = time.perf_counter()
+            self.assertEqual(solver.search(), SOLVED)
+            elapsed = time.perf_counter() - start
+            self.assertEqual(solver.graph.validate(audit=True), True)
+            self.assertEqual(solver.graph.is_solved(), True)
+            if n == 25:
+                self.assertLess(elapsed, LARGE_BUDGET)
+
+    def testCountSolutions(self):
+        load_string(self.solver, HARD)
+        before = self.solver.graph.to_list()
+        self.assertEqual(self.solver.count_solutions(), 1)
+        self.assertEqual(self.solver.is_unique(), True)
+        self.assertEqual(self.solver.graph.to_list(), before)
+        self.assertEqual(self.solver.search(), SOLVED)
+        rectangle = Solver(logger=self.logger)
+        load_string(rectangle, TWO_SOLUTIONS)
+        self.assertEqual(rectangle.count_solutions(limit=10), 2)
+        self.assertEqual(rectangle.count_solutions(limit=1), 1)
+        self.assertEqual(rectangle.is_unique(), False)
+        empty = Solver(logger=self.logger)
+        self.assertEqual(empty.count_solutions(limit=5), 5)
+        self.assertEqual(empty.is_unique(), False)
+        dlx = Solver(logger=self.logger, engine=DLX)
+        self.assertEqual(dlx.count_solutions(limit=3), 3)
+        for solver in [empty, dlx]:
+            with self.assertRaises(Exception):
+                solver.count_solutions(limit=0)
+
+    def testIterSolutions(self):
+        solver = Solver(logger=self.logger, n=4)
+        solutions = list(solver.iter_solutions(line=True))
+        # the number of 4 by 4 sudoku grids
+        self.assertEqual(len(solutions), 288)
+        self.assertEqual(len(set(solutions)), 288)
+        self.assertEqual(solver.graph.to_list(), [[" "] * 4] * 4)
+        check = Solver(logger=self.logger, n=4)
+        for grid in solver.iter_solutions():
+            check.reset()
+            check.load_list(grid)
+            self.assertEqual(check.graph.is_solved(), True)
+            self.assertEqual(check.graph.validate(audit=True), True)
+        load_string(self.solver, TWO_SOLUTIONS)
+        solutions = self.solver.iter_solutions()
+        first = next(solutions)
+        self.assertEqual(first[0][2] in (1, 2), True)
+        solutions.close()
+        self.assertEqual(self.solver.graph.get_node_color(0, 2), None)
+        self.assertEqual(len(list(self.solver.iter_solutions())), 2)
+
+    def testIterSolutionsMemory(self):
+        # walking more solutions of an empty board needs no more memory
+        solver = Solver(logger=self.logger)
+        peaks = []
+        for count in [10, 100]:
+            tracemalloc.start()
+            try:
+                for __ in itertools.islice(solver.iter_solutions(), count):
+                    pass
+                __, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peaks.append(peak)
+        self.assertLess(peaks[1], peaks[0] * 2)
+
+    def testCountNoSolutions(self):
+        load_string(self.solver, ".23456789" + "." * 36 +
+                    "1" + "." * 35)
+        self.assertEqual(self.solver.count_solutions(), 0)
+        self.assertEqual(self.solver.is_unique(), False)
+
+    def testRate(self):
+        self.solver.load(self.test_files[0])
+        grade = self.solver.rate()
+        self.assertEqual(self.solver.graph.is_solved(), True)
+        self.assertEqual(self.solver.graph.validate(audit=True), True)
+        self.assertEqual(grade, dict(LADDER)[self.solver.hardest])
+        self.assertEqual(sum(self.solver.steps.values()) > 0, True)
+        hard = Solver(logger=self.logger)
+        load_string(hard, HARD)
+        self.assertEqual(hard.rate(), dict(LADDER)[GUESS])
+        self.assertEqual(hard.hardest, GUESS)
+        self.assertEqual(hard.steps[GUESS], hard.guesses)
+        self.assertEqual(hard.graph.is_solved(), True)
+        self.assertEqual(grade < dict(LADDER)[GUESS], True)
+        # a full grid needs no technique
+        self.assertEqual(hard.rate(), 0.0)
+        self.assertEqual(hard.steps, {})
+
+    def testRateLadder(self):
+        # the last color of a row is an obvious move, the rest of the
+        # board needs guesses and the ladder is played after each one
+        load_string(self.solver, ".23456789" + "." * 72)
+        self.assertEqual(self.solver.rate(), dict(LADDER)[GUESS])
+        self.assertEqual(self.solver.hardest, GUESS)
+        self.assertEqual(self.solver.steps[OBVIOUS] > 1, True)
+        self.assertEqual(self.solver.steps[GUESS], self.solver.guesses)
+        self.assertEqual(self.solver.graph.get_node_color(0, 0), 0)
+        self.assertEqual(self.solver.graph.is_solved(), True)
+
+    def testRateInvalid(self):
+        load_string(self.solver, ".23456789" + "." * 36 +
+                    "1" + "." * 35)
+        self.assertEqual(self.solver.rate(), None)
+
     def testSolve3(self):
         self.solver.load(self.test_files[2])
         self.solver.solve()
@@ -0,0 +1,329 @@
+"""
+-------------------------------------------------------
+batch
+solves many sudoku puzzles over a pool of processes
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+from solver import Solver, GRAPH
+from solver.stats import Stats
+from solver.reader import parse_line
+import multiprocessing
+import threading
+import logging
+
+# the solver of a worker process, reused for each of its puzzles
+_worker = {}
+
+def solve_many(puzzles, workers=None, chunksize=16, ordered=True,
+               engine=GRAPH, budget=None, stats=None, n=9, box=None):
+    '''
+    a function that solves many puzzles over a pool of processes
+    Parameters:
+        puzzles: an iterable of puzzles, each a list of rows
+                 (see Solver.load_list) or a string in the one line
+                 format (see reader.parse_line)
+        workers: the number of processes, None for one per core
+                 and 1 to solve in this process (int)
+        chunksize: the number of puzzles sent to a process at once (int)
+        ordered: True to yield the results in the order of the puzzles,
+                 False to yield them as they finish (boolean)
+        engine: the search engine (see Solver.search) (str)
+        budget: the most guesses for one puzzle (int)
+        stats: a Stats the work of every puzzle is added to,
+               None to not record it (Stats)
+        n: the size of the puzzles (int)
+        box: the (rows, columns) shape of a box, None for the
+             default shape (see topology.default_box) (tuple)
+    Returns:
+        : a generator of (index, status, grid) where index is the
+          position of the puzzle, status is the search outcome and
+          grid is the board (see Graph.to_list)
+    '''
+    record = stats is not None
+    for result in _map(_solve_one, puzzles, workers, chunksize, ordered,
+                       (engine, budget, record, n, box)):
+        yield _merge(result, stats)
+
+def rate_many(puzzles, workers=None, chunksize=16, ordered=True, n=9,
+              box=None):
+    '''
+    a function that rates and solves many puzzles over a pool of
+    processes (see Solver.rate)
+    Parameters:
+        puzzles: an iterable of puzzles (see solve_many)
+        workers: the number of processes, None for one per core
+                 and 1 to rate in this process (int)
+        chunksize: the number of puzzles sent to a process at once (int)
+        ordered: True to yield the results in the order of the puzzles,
+                 False to yield them as they finish (boolean)
+        n: the size of the puzzles (int)
+        box: the (rows, columns) shape of a box or None (tuple)
+    Returns:
+        : a generator of (index, grade, hardest, steps) where grade is
+          None for a puzzle with no solution, hardest the hardest
+          technique needed and steps the steps of each technique
+    '''
+    for result in _map(_rate_one, puzzles, workers, chunksize, ordered,
+                       (GRAPH, None, False, n, box)):
+        yield result
+
+def _map(function, puzzles, workers, chunksize, ordered, options):
+    '''
+    a function that applies a worker function to many puzzles
+    Parameters:
+        function: the worker function given each (index, puzzle)
+        puzzles: an iterable of puzzles
+        workers: the number of processes, None for one per core
+                 and 1 to work in this process (int)
+        chunksize: the number of puzzles sent to a process at once (int)
+        ordered: True to yield the results in the order of the puzzles,
+                 False to yield them as they finish (boolean)
+        options: the arguments of _start_worker (tuple)
+    Returns:
+        : a generator of the results of the function
+    '''
+    tasks = enumerate(puzzles)
+    if workers == 1:
+        _start_worker(*options)
+        for task in tasks:
+            yield function(task)
+        return
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    # at most a window of puzzles is handed to the pool and not yet
+    # yielded, so a large input is never read into memory all at once
+    # while the workers stay busy past a slow puzzle
+    window = threading.Semaphore(workers * chunksize * 4)
+    stop = threading.Event()
+    pool = multiprocessing.Pool(workers, _start_worker, options)
+    try:
+        if ordered:
+            results = pool.imap(function, _bounded(tasks, window, stop),
+                                chunksize)
+        else:
+            results = pool.imap_unordered(function,
+                                          _bounded(tasks, window, stop),
+                                          chunksize)
+        for result in results:
+            window.release()
+            yield result
+    finally:
+        # the feeding thread of the pool is woken so it stops, then the
+        # puzzles in the window are let finish, terminating the pool
+        # while it is still feeding can deadlock
+        stop.set()
+        window.release()
+        pool.close()
+        pool.join()
+
+def _bounded(tasks, window, stop):
+    '''
+    a generator that hands tasks to a pool, waiting for a place in
+    the window before each one
+    Parameters:
+        tasks: an iterable of tasks
+        window: released once for each result taken (threading.Semaphore)
+        stop: set when no more tasks are wanted (threading.Event)
+    Returns:
+        : a generator of the tasks
+    '''
+    for task in tasks:
+        window.acquire()
+        if stop.is_set():
+            return
+        yield task
+
+def _start_worker(engine, budget, record=False, n=9, box=None):
+    '''
+    a function that sets up the solver of a worker process
+    Parameters:
+        engine: the search engine (str)
+        budget: the most guesses for one puzzle (int)
+        record: True to record the stats of each puzzle (boolean)
+        n: the size of the puzzles (int)
+        box: the (rows, columns) shape of a box or None (tuple)
+    Returns:
+        None
+    '''
+    # a logger of the workers, the logger of the module is left alone
+    logger = logging.getLogger(__name__).getChild("worker")
+    logger.setLevel(logging.WARNING)
+    stats = None
+    if record:
+        stats = Stats()
+    _worker["solver"] = Solver(logger=logger, engine=engine, stats=stats,
+                               n=n, box=box)
+    _worker["budget"] = budget
+
+def _solve_one(task):
+    '''
+    a function that solves one puzzle with the worker's solver
+    Parameters:
+        task: the (index, puzzle) to solve (tuple)
+    Returns:
+        : (index, status, grid, stats) where stats are the counters
+          of the puzzle or None (tuple)
+    '''
+    index, puzzle = task
+    solver = _worker["solver"]
+    if isinstance(puzzle, str):
+        puzzle = parse_line(puzzle, solver.n)
+    solver.reset()
+    solver.load_list(puzzle)
+    status = solver.search(budget=_worker["budget"])
+    stats = None
+    if solver.stats is not None:
+        stats = solver.stats.to_dict()
+        solver.stats.reset()
+    return (index, status, solver.graph.to_list(), stats)
+
+def _rate_one(task):
+    '''
+    a function that rates one puzzle with the worker's solver
+    Parameters:
+        task: the (index, puzzle) to rate (tuple)
+    Returns:
+        : (index, grade, hardest, steps) (tuple)
+    '''
+    index, puzzle = task
+    solver = _worker["solver"]
+    if isinstance(puzzle, str):
+        puzzle = parse_line(puzzle, solver.n)
+    solver.reset()
+    solver.load_list(puzzle)
+    grade = solver.rate()
+    return (index, grade, solver.hardest, dict(solver.steps))
+
+def _merge(result, stats):
+    '''
+    a function that adds the counters of a result to the batch stats
+    Parameters:
+        result: the (index, status, grid, stats) of a puzzle (tuple)
+        stats: the batch stats or None (Stats)
+    Returns:
+        : the (index, status, grid) of the puzzle (tuple)
+    '''
+    index, status, grid, counters = result
+    if stats is not None:
+        stats.merge(counters)
+    return (index, status, grid)
+
+import unittest
+import os
+from solver import SOLVED, UNSOLVABLE, DLX
+from solver.reader import read_puzzles, to_line
+from solver.graph import LADDER
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.WARNING)
+        test_directory = os.path.dirname(os.getcwd())
+        self.puzzles = []
+        for name in ["test.txt", "test2.txt", "test3.txt"]:
+            solver = Solver(logger=self.logger)
+            solver.load(os.path.join(test_directory, "tests", name))
+            self.puzzles.append(solver.graph.to_list())
+        # the top left node needs color 0 which its column already has
+        invalid = [[" "] * 9 for __ in range(9)]
+        invalid[0] = [" ", 1, 2, 3, 4, 5, 6, 7, 8]
+        invalid[5][0] = 0
+        self.puzzles.append(invalid)
+
+    def tearDown(self):
+        pass
+
+    def check(self, results):
+        self.assertEqual(len(results), 4)
+        for index, status, grid in results:
+            if index == 3:
+                self.assertEqual(status, UNSOLVABLE)
+            else:
+                self.assertEqual(status, SOLVED)
+                solver = Solver(logger=self.logger)
+                solver.load_list(grid)
+                self.assertEqual(solver.graph.is_solved(), True)
+                self.assertEqual(solver.graph.validate(), True)
+
+    def testSolveManyInProcess(self):
+        results = list(solve_many(self.puzzles, workers=1))
+        self.assertEqual([r[0] for r in results], [0, 1, 2, 3])
+        self.check(results)
+
+    def testSolveManyOrdered(self):
+        results = list(solve_many(self.puzzles, workers=2, chunksize=1))
+        self.assertEqual([r[0] for r in results], [0, 1, 2, 3])
+        self.check(results)
+
+    def testSolveManyLines(self):
+        lines = [to_line(puzzle) for puzzle in self.puzzles]
+        results = list(solve_many(read_puzzles(lines), workers=2,
+                                  chunksize=1))
+        self.assertEqual([r[0] for r in results], [0, 1, 2, 3])
+        self.check(results)
+        results = list(solve_many(lines, workers=1))
+        self.check(results)
+
+    def testSolveManyStats(self):
+        stats = Stats()
+        results = list(solve_many(self.puzzles, workers=2, stats=stats))
+        self.check(results)
+        single = Stats()
+        list(solve_many(self.puzzles, workers=1, stats=single))
+        self.assertEqual(stats.sweeps, single.sweeps)
+        self.assertEqual(stats.guesses, single.guesses)
+        for technique, counters in single.techniques.items():
+            self.assertEqual(stats.techniques[technique]["placements"],
+                             counters["placements"])
+
+    def testSolveManySixteen(self):
+        path = os.path.join(os.path.dirname(os.getcwd()), "benchmarks",
+                            "sixteen.txt")
+        puzzles = list(read_puzzles(path, 16))[:2]
+        results = list(solve_many(puzzles, workers=1, n=16))
+        self.assertEqual([r[1] for r in results], [SOLVED, SOLVED])
+        for index, status, grid in results:
+            solver = Solver(logger=self.logger, n=16)
+            solver.load_list(grid)
+            self.assertEqual(solver.graph.is_solved(), True)
+            self.assertEqual(solver.graph.validate(), True)
+
+    def testRateMany(self):
+        results = list(rate_many(self.puzzles, workers=2, chunksize=1))
+        self.assertEqual([r[0] for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[3][1], None)
+        single = list(rate_many(self.puzzles, workers=1))
+        self.assertEqual(results, single)
+        for index, grade, hardest, steps in results[:3]:
+            self.assertEqual(grade, dict(LADDER)[hardest])
+            self.assertEqual(hardest in steps, True)
+
+    def testLoggerLeftAlone(self):
+        self.logger.setLevel(logging.NOTSET)
+        list(solve_many(self.puzzles, workers=1))
+        self.assertEqual(self.logger.level, logging.NOTSET)
+
+    def testSolveManyWindow(self):
+        # more puzzles than fit in the window of two workers
+        puzzles = self.puzzles * 12
+        results = list(solve_many(puzzles, workers=2, chunksize=1))
+        self.assertEqual([result[0] for result in results],
+                         list(range(len(puzzles))))
+        # stopping early does not hang the pool
+        results = solve_many(puzzles, workers=2, chunksize=1)
+        next(results)
+        results.close()
+
+    def testSolveManyUnordered(self):
+        results = list(solve_many(self.puzzles, workers=2, ordered=False,
+                                  engine=DLX))
+        self.assertEqual(sorted(r[0] for r in results), [0, 1, 2, 3])
+        self.check(results)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+"""
+-------------------------------------------------------
+benchmark
+times the solver over the puzzle corpora in benchmarks/
+and compares a run against a stored baseline
+usage: python -m solver.benchmark [--save FILE] [--baseline FILE]
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+from solver import Solver, SOLVED, GRAPH, DLX
+from solver.reader import read_puzzles
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+# the corpora from easiest to hardest, then the larger boards
+TIERS = ("easy", "hard", "seventeen", "invalid", "sixteen", "twentyfive")
+# the size of the boards of a corpus, 9 when not listed
+SIZES = {"sixteen": 16, "twentyfive": 25}
+# the (engine, mode) pairs timed, logic only propagates the moves
+SEARCH = "search"
+LOGIC = "logic"
+RUNS = ((GRAPH, SEARCH), (DLX, SEARCH), (GRAPH, LOGIC))
+# dancing links alone does not finish the larger boards in any
+# reasonable time, only the graph engine is timed on them
+LARGE_RUNS = ((GRAPH, SEARCH), (GRAPH, LOGIC))
+CORPORA = os.path.join(os.path.dirname(os.path.dirname(
+                                    os.path.abspath(__file__))), "benchmarks")
+
+def load_corpus(tier, directory=CORPORA):
+    '''
+    a function that loads the puzzles of a tier
+    Parameters:
+        tier: the name of the corpus (str)
+        directory: the directory of the corpora (str)
+    Returns:
+        : the puzzles of the corpus (list)
+    '''
+    return list(read_puzzles(os.path.join(directory, tier + ".txt"),
+                             SIZES.get(tier, 9)))
+
+def percentile(values, fraction):
+    '''
+    a function that finds a percentile by the nearest rank
+    Parameters:
+        values: the sorted values (list)
+        fraction: the percentile between 0 and 1 (float)
+    Returns:
+        : the value at that percentile (float)
+    '''
+    if len(values) == 0:
+        return 0.0
+    rank = int(round(fraction * (len(values) - 1)))
+    return values[rank]
+
+def time_run(puzzles, engine, mode, budget=None, n=9):
+    '''
+    a function that solves every puzzle once and times each one
+    Parameters:
+        puzzles: the puzzles (list)
+        engine: the search engine (str)
+        mode: SEARCH or LOGIC (str)
+        budget: the most guesses for one puzzle (int)
+        n: the size of the puzzles (int)
+    Returns:
+        (latencies, solved): the seconds taken by each puzzle and
+                             the number solved (tuple)
+    '''
+    logger = logging.getLogger(__name__)
+    solver = Solver(logger=logger, engine=engine, n=n)
+    latencies = []
+    solved = 0
+    for puzzle in puzzles:
+        start = time.perf_counter()
+        solver.reset()
+        solver.load_list(puzzle)
+        if mode == LOGIC:
+            done = solver.propagate()
+        else:
+            done = solver.search(budget=budget) == SOLVED
+        latencies.append(time.perf_counter() - start)
+        if done:
+            solved += 1
+    return (latencies, solved)
+
+def peak_memory(puzzles, engine, mode, budget=None, n=9):
+    '''
+    a function that finds the peak memory allocated solving puzzles
+    Parameters:
+        puzzles: the puzzles (list)
+        engine: the search engine (str)
+        mode: SEARCH or LOGIC (str)
+        budget: the most guesses for one puzzle (int)
+        n: the size of the puzzles (int)
+    Returns:
+        : the peak in kilobytes (float)
+    '''
+    tracemalloc.start()
+    try:
+        time_run(puzzles, engine, mode, budget, n)
+        __, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+def run(tiers=TIERS, runs=None, repeat=1, budget=None, limit=None,
+        directory=CORPORA):
+    '''
+    a function that benchmarks every run over every tier
+    Parameters:
+        tiers: the corpora to use (tuple)
+        runs: the (engine, mode) pairs to time, None for RUNS on
+              9 by 9 boards and LARGE_RUNS on larger ones (tuple)
+        repeat: the number of times each corpus is solved (int)
+        budget: the most guesses for one puzzle (int)
+        limit: the most puzzles to use from a corpus (int)
+        directory: the directory of the corpora (str)
+    Returns:
+        results: for each "tier/engine/mode" the puzzles, solve_rate,
+                 puzzles_per_second, p50_ms, p99_ms and peak_kb (dict)
+    '''
+    results = {}
+    for tier in tiers:
+        puzzles = load_corpus(tier, directory)[:limit]
+        n = SIZES.get(tier, 9)
+        pairs = runs
+        if pairs is None:
+            pairs = RUNS if n == 9 else LARGE_RUNS
+        for engine, mode in pairs:
+            latencies = []
+            solved = 0
+            for __ in range(repeat):
+                times, count = time_run(puzzles, engine, mode, budget, n)
+                latencies.extend(times)
+                solved += count
+            latencies.sort()
+            total = sum(latencies)
+            result = {"puzzles": len(puzzles),
+                      "solve_rate": solved / float(len(latencies) or 1),
+                      "puzzles_per_second": len(latencies) / total
+                                            if total > 0 else 0.0,
+                      "p50_ms": percentile(latencies, 0.5) * 1000,
+                      "p99_ms": percentile(latencies, 0.99) * 1000,
+                      "peak_kb": peak_memory(puzzles, engine, mode, budget,
+                                             n)}
+            results["%s/%s/%s" % (tier, engine, mode)] = result
+    return results
+
+def compare(results, baseline, threshold=0.2):
+    '''
+    a function that finds the regressions from a baseline
+    Parameters:
+        results: the results of run (dict)
+        baseline: the results of an earlier run (dict)
+        threshold: the allowed relative change (float)
+    Returns:
+        regressions: a message for each regression (list)
+    '''
+    regressions = []
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        now = results[key]
+        before = baseline[key]
+        # lower is worse for these
+        for field in ("puzzles_per_second", "solve_rate"):
+            if now[field] < before[field] * (1 - threshold):
+                regressions.append("%s %s: %.3f < %.3f" % (key, field,
+                                   now[field], before[field]))
+        # higher is worse for these
+        for field in ("p50_ms", "p99_ms", "peak_kb"):
+            if now[field] > before[field] * (1 + threshold):
+                regressions.append("%s %s: %.3f > %.3f" % (key, field,
+                                   now[field], before[field]))
+    return regressions
+
+def report(results):
+    '''
+    a function that formats the results as a table
+    Parameters:
+        results: the results of run (dict)
+    Returns:
+        : the table (str)
+    '''
+    lines = ["%-28s %7s %6s %10s %9s %9s %9s" % ("run", "puzzles", "solved",
+                                               "puzzles/s", "p50 ms",
+                                               "p99 ms", "peak kb")]
+    for key in sorted(results):
+        result = results[key]
+        lines.append("%-28s %7d %5.0f%% %10.1f %9.2f %9.2f %9.1f"
+                     % (key, result["puzzles"], result["solve_rate"] * 100,
+                        result["puzzles_per_second"], result["p50_ms"],
+                        result["p99_ms"], result["peak_kb"]))
+    return "\n".join(lines)
+
+def main(argv=None):
+    '''
+    a function that runs the benchmark from the command line
+    Parameters:
+        argv: the command line arguments (list)
+    Returns:
+        : 1 if there were regressions, 0 otherwise (int)
+    '''
+    parser = argparse.ArgumentParser(description="Benchmark the solver")
+    parser.add_argument("--tiers", nargs="+", default=TIERS)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--budget", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--save", help="write the results to this json file")
+    parser.add_argument("--baseline", help="compare to this json file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    # the invalid corpus would log every clash it finds
+    logging.getLogger(__name__).setLevel(logging.CRITICAL)
+    results = run(args.tiers, repeat=args.repeat, budget=args.budget,
+                  limit=args.limit)
+    print(report(results))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+import unittest
+
+class BenchmarkTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.getLogger(__name__).setLevel(logging.CRITICAL)
+
+    def tearDown(self):
+        pass
+
+    def testCorpora(self):
+        self.assertEqual(len(load_corpus("easy")) >= 40, True)
+        for puzzle in load_corpus("seventeen"):
+            clues = sum(1 for row in puzzle for color in row if color != " ")
+            self.assertEqual(clues, 17)
+        for tier, n in SIZES.items():
+            for puzzle in load_corpus(tier):
+                self.assertEqual([len(row) for row in puzzle], [n] * n)
+
+    def testRun(self):
+        results = run(("easy", "invalid"), limit=3)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results["easy/graph/logic"]["solve_rate"], 1.0)
+        self.assertEqual(results["easy/dlx/search"]["puzzles"], 3)
+        self.assertEqual(results["invalid/graph/search"]["solve_rate"], 0.0)
+        for result in results.values():
+            self.assertEqual(result["p99_ms"] >= result["p50_ms"], True)
+            self.assertEqual(result["peak_kb"] > 0, True)
+
+    def testPercentile(self):
+        values = list(range(101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def testCompare(self):
+        baseline = {"easy/graph/search": {"puzzles": 1, "solve_rate": 1.0,
+                                          "puzzles_per_second": 100.0,
+                                          "p50_ms": 10.0, "p99_ms": 20.0,
+                                          "peak_kb": 50.0}}
+        results = {"easy/graph/search": dict(baseline["easy/graph/search"])}
+        self.assertEqual(compare(results, baseline), [])
+        results["easy/graph/search"]["puzzles_per_second"] = 70.0
+        results["easy/graph/search"]["p99_ms"] = 23.0
+        regressions = compare(results, baseline)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0].startswith(
+                         "easy/graph/search puzzles_per_second"), True)
+        self.assertEqual(len(compare(results, baseline, threshold=0.1)), 2)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        unittest.main(argv=sys.argv[:1])
+    else:
+        sys.exit(main())
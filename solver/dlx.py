@@ -0,0 +1,301 @@
+"""
+-------------------------------------------------------
+dlx
+contains the DancingLinks class, an exact cover solver
+(Algorithm X with dancing links) for a sudoku Graph
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+from solver.graph import mask_to_colors
+
+class DancingLinks():
+    '''
+    DancingLinks
+        the exact cover problem of a sudoku Graph
+        every node must get one color and every unit must use
+        every color once
+    '''
+    def __init__(self, graph):
+        '''
+        constructor
+            builds the exact cover matrix from the colors and
+            palettes of the graph
+            Parameters:
+                graph: the sudoku graph (Graph)
+        '''
+        topology = graph.topology
+        n = topology.n
+        size = topology.size
+        cell_units = topology.cell_units
+        # column 0 is the root, columns 1..number are the constraints:
+        # one per node then one per (unit, color)
+        number = size + len(topology.units) * n
+        self.size = size
+        self.left = list(range(-1, number))
+        self.left[0] = number
+        self.right = list(range(1, number + 2))
+        self.right[number] = 0
+        self.up = list(range(number + 1))
+        self.down = list(range(number + 1))
+        self.column = list(range(number + 1))
+        self.count = [0] * (number + 1)
+        # the (node id, color) of every data node
+        self.choice = [None] * (number + 1)
+        self.given = [None] * size
+        given_columns = []
+        for node_id in range(size):
+            row, column = graph.get_row_column(node_id)
+            color = graph.get_node_color(row, column)
+            columns = [node_id + 1]
+            if color is not None:
+                self.given[node_id] = color
+                for unit_id in cell_units[node_id]:
+                    columns.append(size + unit_id * n + color + 1)
+                given_columns.append(columns)
+                continue
+            mask = graph.get_available_mask(row, column)
+            for color in mask_to_colors(mask):
+                columns = [node_id + 1]
+                for unit_id in cell_units[node_id]:
+                    columns.append(size + unit_id * n + color + 1)
+                self.add_row(columns, (node_id, color))
+        # the given colors are taken before searching
+        self.valid = True
+        covered = [False] * (number + 1)
+        for columns in given_columns:
+            for c in columns:
+                if covered[c]:
+                    # two given colors clash
+                    self.valid = False
+                else:
+                    covered[c] = True
+                    self.cover(c)
+        self.solutions = []
+        self.guesses = 0
+        self.exceeded = False
+
+    def add_row(self, columns, choice):
+        '''
+        a method that adds a row to the matrix
+        Parameters:
+            columns: the constraint columns the row covers (list)
+            choice: the (node id, color) of the row (tuple)
+        Returns:
+            None
+        '''
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+        first = None
+        for c in columns:
+            x = len(left)
+            self.column.append(c)
+            self.choice.append(choice)
+            self.count[c] += 1
+            # insert at the bottom of the column
+            up.append(up[c])
+            down.append(c)
+            down[up[c]] = x
+            up[c] = x
+            if first is None:
+                first = x
+                left.append(x)
+                right.append(x)
+            else:
+                left.append(left[first])
+                right.append(first)
+                right[left[first]] = x
+                left[first] = x
+
+    def cover(self, c):
+        '''
+        a method that removes a column and the rows that use it
+        Parameters:
+            c: the column (int)
+        Returns:
+            None
+        '''
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+        column = self.column
+        count = self.count
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                count[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c):
+        '''
+        a method that puts back a column removed by cover
+        Parameters:
+            c: the column (int)
+        Returns:
+            None
+        '''
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+        column = self.column
+        count = self.count
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                count[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def solve(self, limit=1, budget=None):
+        '''
+        a method that finds the solutions of the exact cover
+        Parameters:
+            limit: stop after finding this many solutions (int)
+            budget: the most rows to try, None for no limit (int)
+        Returns:
+            solutions: the solutions found, each a list of the
+                       color of every node (list)
+        '''
+        self.solutions = []
+        self.guesses = 0
+        self.exceeded = False
+        if self.valid:
+            self._search([], limit, budget)
+        return self.solutions
+
+    def _search(self, chosen, limit, budget):
+        '''
+        a method that does one level of Algorithm X
+        Parameters:
+            chosen: the rows chosen so far (list)
+            limit: stop after finding this many solutions (int)
+            budget: the most rows to try, None for no limit (int)
+        Returns:
+            True if the search should stop
+            False otherwise
+        '''
+        right = self.right
+        down = self.down
+        count = self.count
+        if right[0] == 0:
+            solution = list(self.given)
+            for x in chosen:
+                node_id, color = self.choice[x]
+                solution[node_id] = color
+            self.solutions.append(solution)
+            return len(self.solutions) >= limit
+        # the column with the fewest rows
+        c = right[0]
+        best = c
+        fewest = count[c]
+        while c != 0 and fewest > 1:
+            if count[c] < fewest:
+                best = c
+                fewest = count[c]
+            c = right[c]
+        if fewest == 0:
+            return False
+        c = best
+        self.cover(c)
+        stop = False
+        r = down[c]
+        while r != c and not stop:
+            if budget is not None and self.guesses >= budget:
+                self.exceeded = True
+                stop = True
+                break
+            self.guesses += 1
+            chosen.append(r)
+            j = right[r]
+            while j != r:
+                self.cover(self.column[j])
+                j = right[j]
+            stop = self._search(chosen, limit, budget)
+            j = self.left[r]
+            while j != r:
+                self.uncover(self.column[j])
+                j = self.left[j]
+            chosen.pop()
+            r = down[r]
+        self.uncover(c)
+        return stop
+
+import unittest
+import logging
+from solver.graph import Graph
+
+class DancingLinksTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def load(self, puzzle):
+        for index, symbol in enumerate(puzzle):
+            if symbol != ".":
+                self.g.set_node_color(index // 9, index % 9, int(symbol) - 1)
+
+    def testSolveUnique(self):
+        self.load("8........"
+                  "..36....."
+                  ".7..9.2.."
+                  ".5...7..."
+                  "....457.."
+                  "...1...3."
+                  "..1....68"
+                  "..85...1."
+                  ".9....4..")
+        solutions = DancingLinks(self.g).solve(limit=2)
+        self.assertEqual(len(solutions), 1)
+        solution = solutions[0]
+        self.assertEqual(solution[:9], [7, 0, 1, 6, 4, 2, 5, 3, 8])
+        self.assertEqual(solution[0], 7)
+
+    def testSolveMany(self):
+        links = DancingLinks(self.g)
+        self.assertEqual(len(links.solve(limit=1)), 1)
+        self.assertEqual(len(links.solve(limit=2)), 2)
+        for solution in links.solve(limit=3):
+            for unit in self.g.topology.units:
+                colors = sorted(solution[x] for x in unit)
+                self.assertEqual(colors, list(range(9)))
+
+    def testSolveInvalid(self):
+        self.g.set_node_color(0, 0, 0)
+        self.g.set_node_color(0, 8, 0)
+        links = DancingLinks(self.g)
+        self.assertEqual(links.valid, False)
+        self.assertEqual(links.solve(), [])
+
+    def testSolveUnsolvable(self):
+        self.load(".23456789" + "." * 36 + "1........" + "." * 27)
+        self.assertEqual(DancingLinks(self.g).solve(), [])
+
+    def testBudget(self):
+        links = DancingLinks(self.g)
+        self.assertEqual(links.solve(budget=5), [])
+        self.assertEqual(links.exceeded, True)
+        self.assertEqual(links.guesses, 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,428 @@
+"""
+-------------------------------------------------------
+generator
+makes random puzzles with one solution, a random full grid
+is made then clues are taken away while the solution stays unique
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+from solver import Solver, SOLVED, UNSOLVABLE, GRAPH, DLX
+from solver.graph import TIERS
+from solver.batch import _bounded
+import multiprocessing
+import threading
+import logging
+import random
+
+# the symmetries of the clues, a clue is taken away with its images
+NONE = "none"
+ROTATIONAL = "rotational"
+MIRROR = "mirror"
+DIAGONAL = "diagonal"
+SYMMETRIES = (NONE, ROTATIONAL, MIRROR, DIAGONAL)
+# the difficulties from easiest to hardest:
+# easy puzzles fall to the moves of the nodes (singles, subsets of a
+# node and locked candidates), medium ones need the tiers of the graph
+# (subsets, fish, chains) and hard ones need guessing
+EASY = "easy"
+MEDIUM = "medium"
+HARD = "hard"
+DIFFICULTIES = (EASY, MEDIUM, HARD)
+
+# the solver of a worker process and the options of its puzzles
+_worker = {}
+
+def make_solver(n=9, box=None, logger=None):
+    '''
+    a function that makes the solver the generator works with, the
+    uniqueness checks search with dancing links up to 9 by 9 boards
+    where it beats the graph search, larger boards use the graph
+    Parameters:
+        n: the size of the board (int)
+        box: the (rows, columns) shape of a box or None (tuple)
+        logger: the logger of the solver (logging.Logger)
+    Returns:
+        : the solver (Solver)
+    '''
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    engine = DLX if n <= 9 else GRAPH
+    return Solver(logger=logger, engine=engine, n=n, box=box)
+
+def orbit(row, column, n, symmetry=NONE):
+    '''
+    a function that gets the nodes a clue is taken away with
+    Parameters:
+        row: the row of the clue (int)
+        column: the column of the clue (int)
+        n: the size of the board (int)
+        symmetry: one of SYMMETRIES (str)
+    Returns:
+        : the (row, column) of the nodes, the clue first (list)
+    Raises:
+        Exception: if the symmetry is unknown
+    '''
+    if symmetry == NONE:
+        image = (row, column)
+    elif symmetry == ROTATIONAL:
+        image = (n - 1 - row, n - 1 - column)
+    elif symmetry == MIRROR:
+        image = (row, n - 1 - column)
+    elif symmetry == DIAGONAL:
+        image = (column, row)
+    else:
+        raise Exception("Unknown symmetry: %s" % symmetry)
+    if image == (row, column):
+        return [(row, column)]
+    return [(row, column), image]
+
+def full_grid(rng, solver):
+    '''
+    a function that makes a random full grid, the boxes on the
+    diagonal share no row or column so they are filled at random
+    (the first row on a board without boxes) and the search fills
+    the rest, then the colors are relabelled
+    Parameters:
+        rng: the random number generator (random.Random)
+        solver: the solver of the board size, it is reset (Solver)
+    Returns:
+        grid: the full grid in the Graph.to_list format (list)
+    '''
+    n = solver.n
+    shape = solver.graph.box_shape()
+    while True:
+        solver.reset()
+        if shape:
+            box_rows, box_columns = shape
+            for index in range(min(n // box_rows, n // box_columns)):
+                colors = list(range(n))
+                rng.shuffle(colors)
+                for r in range(box_rows):
+                    for c in range(box_columns):
+                        solver.graph.set_node_color(index * box_rows + r,
+                                                    index * box_columns + c,
+                                                    colors.pop())
+        else:
+            colors = list(range(n))
+            rng.shuffle(colors)
+            for column in range(n):
+                solver.graph.set_node_color(0, column, colors.pop())
+        if solver.search() == SOLVED:
+            break
+    labels = list(range(n))
+    rng.shuffle(labels)
+    return [[labels[color] for color in row]
+            for row in solver.graph.to_list()]
+
+def difficulty_of(solver, puzzle):
+    '''
+    a function that finds the difficulty of a puzzle with one solution
+    Parameters:
+        solver: the solver of the board size, it is reset (Solver)
+        puzzle: the puzzle in the Graph.to_list format (list)
+    Returns:
+        : one of DIFFICULTIES (str)
+    '''
+    if solves(solver, puzzle, []):
+        return EASY
+    if solves(solver, puzzle, TIERS):
+        return MEDIUM
+    return HARD
+
+def solves(solver, puzzle, tiers):
+    '''
+    a function that checks the moves of the nodes and some tiers
+    solve a puzzle, which proves it has one solution
+    Parameters:
+        solver: the solver of the board size, it is reset (Solver)
+        puzzle: the puzzle in the Graph.to_list format (list)
+        tiers: the tiers of the graph to play (see Graph.tiers) (list)
+    Returns:
+        True if the puzzle was solved
+        False otherwise
+    '''
+    graph = solver.graph
+    saved = graph.tiers
+    graph.tiers = list(tiers)
+    try:
+        graph.load_grid(puzzle)
+        return solver.propagate()
+    finally:
+        graph.tiers = saved
+
+def is_unique_without(solver, puzzle, solution, removed):
+    '''
+    a function that checks a puzzle with one solution keeps it once
+    some of its clues are taken away, any other solution would differ
+    at a node taken away so each one is searched with the color of
+    the solution forbidden, which fails fast on a unique puzzle
+    Parameters:
+        solver: the solver of the board size, it is reset (Solver)
+        puzzle: the puzzle without the clues (list)
+        solution: the solution of the puzzle (list)
+        removed: the (row, column) of the clues taken away (list)
+    Returns:
+        True if the puzzle still has one solution
+        False otherwise
+    '''
+    for row, column in removed:
+        solver.graph.load_grid(puzzle)
+        node_id = column + solver.n * row
+        solver.graph.remove_colors(node_id, 1 << solution[row][column])
+        if solver.search() != UNSOLVABLE:
+            return False
+    return True
+
+def generate(seed=None, n=9, box=None, symmetry=NONE, difficulty=None,
+             min_clues=0, attempts=50, solver=None):
+    '''
+    a function that makes a puzzle with one solution, the clues are
+    taken away in a random order (with their images under the
+    symmetry) as long as the solution stays unique, the puzzle stays
+    within the difficulty and it keeps at least min_clues clues
+    Parameters:
+        seed: the seed of the random numbers, the same seed makes the
+              same puzzle (int or str)
+        n: the size of the board (int)
+        box: the (rows, columns) shape of a box or None (tuple)
+        symmetry: one of SYMMETRIES (str)
+        difficulty: one of DIFFICULTIES or None for any (str)
+        min_clues: the fewest clues to keep (int)
+        attempts: the most full grids to try for the difficulty (int)
+        solver: a solver of the board size to reuse (Solver)
+    Returns:
+        (puzzle, solution, difficulty): the puzzle and its solution in
+                                        the Graph.to_list format and
+                                        its difficulty (tuple)
+    Raises:
+        Exception: if the difficulty or symmetry is unknown or no
+                   puzzle of the difficulty was made in the attempts
+    '''
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise Exception("Unknown difficulty: %s" % difficulty)
+    if symmetry not in SYMMETRIES:
+        raise Exception("Unknown symmetry: %s" % symmetry)
+    if solver is None:
+        solver = make_solver(n, box)
+    rng = random.Random(seed)
+    for __ in range(attempts):
+        solution = full_grid(rng, solver)
+        puzzle = [list(row) for row in solution]
+        clues = n * n
+        cells = [(row, column) for row in range(n) for column in range(n)]
+        rng.shuffle(cells)
+        for row, column in cells:
+            if puzzle[row][column] == " ":
+                continue
+            removed = orbit(row, column, n, symmetry)
+            if clues - len(removed) < min_clues:
+                continue
+            for r, c in removed:
+                puzzle[r][c] = " "
+            if _keeps(solver, puzzle, solution, removed, difficulty):
+                clues -= len(removed)
+            else:
+                for r, c in removed:
+                    puzzle[r][c] = solution[r][c]
+        found = difficulty_of(solver, puzzle)
+        if difficulty is None or found == difficulty:
+            return (puzzle, solution, found)
+    raise Exception("No %s puzzle in %d attempts" % (difficulty, attempts))
+
+def _keeps(solver, puzzle, solution, removed, difficulty):
+    '''
+    a function that checks a puzzle can lose some clues, logic that
+    solves a puzzle proves it has one solution so the easier
+    difficulties need no search
+    Parameters:
+        solver: the solver of the board size (Solver)
+        puzzle: the puzzle without the clues (list)
+        solution: the solution of the puzzle (list)
+        removed: the (row, column) of the clues taken away (list)
+        difficulty: one of DIFFICULTIES or None (str)
+    Returns:
+        True if the clues can go
+        False otherwise
+    '''
+    if difficulty == EASY:
+        return solves(solver, puzzle, [])
+    if difficulty == MEDIUM:
+        # the moves of the nodes are much cheaper than the tiers
+        return solves(solver, puzzle, []) or solves(solver, puzzle, TIERS)
+    return is_unique_without(solver, puzzle, solution, removed)
+
+def generate_many(count, seed=0, workers=None, chunksize=4, **options):
+    '''
+    a function that makes many puzzles over a pool of processes,
+    puzzle x is made from the seed "seed:x" so the output does not
+    depend on the number of workers and batches of other seeds or
+    counts never share a puzzle seed
+    Parameters:
+        count: the number of puzzles (int)
+        seed: the seed of the batch (int)
+        workers: the number of processes, None for one per core
+                 and 1 to work in this process (int)
+        chunksize: the number of puzzles sent to a process at once (int)
+        options: the options of generate (n, box, symmetry,
+                 difficulty, min_clues, attempts)
+    Returns:
+        : a generator of (index, puzzle, solution, difficulty) in the
+          order of the puzzles (see generate)
+    '''
+    tasks = ((index, "%d:%d" % (seed, index)) for index in range(count))
+    if workers == 1:
+        _start_worker(options)
+        for task in tasks:
+            yield _generate_one(task)
+        return
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    # the pool is fed a window of puzzles at a time and is let finish
+    # them when stopped early (see batch._map)
+    window = threading.Semaphore(workers * chunksize * 2)
+    stop = threading.Event()
+    pool = multiprocessing.Pool(workers, _start_worker, (options,))
+    try:
+        for result in pool.imap(_generate_one, _bounded(tasks, window, stop),
+                                chunksize):
+            window.release()
+            yield result
+    finally:
+        stop.set()
+        window.release()
+        pool.close()
+        pool.join()
+
+def _start_worker(options):
+    '''
+    a function that sets up the solver of a worker process
+    Parameters:
+        options: the options of generate (dict)
+    Returns:
+        None
+    '''
+    # a logger of the workers, the logger of the module is left alone
+    logger = logging.getLogger(__name__).getChild("worker")
+    logger.setLevel(logging.WARNING)
+    _worker["solver"] = make_solver(options.get("n", 9), options.get("box"),
+                                    logger)
+    _worker["options"] = options
+
+def _generate_one(task):
+    '''
+    a function that makes one puzzle with the worker's solver
+    Parameters:
+        task: the (index, seed) of the puzzle (tuple)
+    Returns:
+        : (index, puzzle, solution, difficulty) (tuple)
+    '''
+    index, seed = task
+    puzzle, solution, difficulty = generate(seed, solver=_worker["solver"],
+                                            **_worker["options"])
+    return (index, puzzle, solution, difficulty)
+
+import unittest
+
+class GeneratorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.WARNING)
+        self.solver = make_solver(logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def check(self, puzzle, solution, n=9):
+        checker = Solver(logger=self.logger, n=n)
+        checker.load_list(puzzle)
+        self.assertEqual(checker.count_solutions(), 1)
+        checker.search()
+        self.assertEqual(checker.graph.to_list(), solution)
+        for row in range(n):
+            for column in range(n):
+                if puzzle[row][column] != " ":
+                    self.assertEqual(puzzle[row][column],
+                                     solution[row][column])
+
+    def testOrbit(self):
+        self.assertEqual(orbit(1, 2, 9), [(1, 2)])
+        self.assertEqual(orbit(1, 2, 9, ROTATIONAL), [(1, 2), (7, 6)])
+        self.assertEqual(orbit(4, 4, 9, ROTATIONAL), [(4, 4)])
+        self.assertEqual(orbit(1, 2, 9, MIRROR), [(1, 2), (1, 6)])
+        self.assertEqual(orbit(1, 2, 9, DIAGONAL), [(1, 2), (2, 1)])
+        with self.assertRaises(Exception):
+            orbit(1, 2, 9, "xx")
+
+    def testFullGrid(self):
+        grid = full_grid(random.Random(1), self.solver)
+        self.solver.reset()
+        self.solver.load_list(grid)
+        self.assertEqual(self.solver.graph.is_solved(), True)
+        self.assertEqual(self.solver.graph.validate(audit=True), True)
+        self.assertNotEqual(full_grid(random.Random(2), self.solver), grid)
+
+    def testGenerate(self):
+        puzzle, solution, difficulty = generate(7, solver=self.solver)
+        self.check(puzzle, solution)
+        self.assertEqual(difficulty in DIFFICULTIES, True)
+        self.assertEqual(generate(7)[0], puzzle)
+
+    def testSymmetry(self):
+        puzzle, solution, __ = generate(3, symmetry=ROTATIONAL,
+                                        solver=self.solver)
+        self.check(puzzle, solution)
+        for row in range(9):
+            for column in range(9):
+                self.assertEqual(puzzle[row][column] == " ",
+                                 puzzle[8 - row][8 - column] == " ")
+
+    def testMinClues(self):
+        puzzle, solution, __ = generate(5, min_clues=40, solver=self.solver)
+        self.check(puzzle, solution)
+        clues = sum(1 for row in puzzle for color in row if color != " ")
+        self.assertEqual(clues >= 40, True)
+
+    def testDifficulty(self):
+        for difficulty in [EASY, MEDIUM]:
+            puzzle, solution, found = generate(11, difficulty=difficulty,
+                                               solver=self.solver)
+            self.assertEqual(found, difficulty)
+            self.assertEqual(difficulty_of(self.solver, puzzle), difficulty)
+            self.check(puzzle, solution)
+        with self.assertRaises(Exception):
+            generate(1, difficulty="xx")
+
+    def testOtherSizes(self):
+        puzzle, solution, __ = generate(2, n=6)
+        self.check(puzzle, solution, n=6)
+
+    def testNoBoxes(self):
+        # 7 is prime so the board has no boxes
+        puzzle, solution, __ = generate(2, n=7)
+        self.check(puzzle, solution, n=7)
+
+    def testBatchSeeds(self):
+        first = [result[1] for result in generate_many(4, seed=0, workers=1)]
+        second = [result[1] for result in generate_many(2, seed=1,
+                                                        workers=1)]
+        for puzzle in second:
+            self.assertEqual(puzzle in first, False)
+
+    def testGenerateManyStop(self):
+        results = generate_many(40, seed=3, workers=2, chunksize=1)
+        self.assertEqual(next(results)[0], 0)
+        # stopping early finishes the window of the pool and returns
+        results.close()
+
+    def testGenerateMany(self):
+        here = list(generate_many(4, seed=9, workers=1))
+        pool = list(generate_many(4, seed=9, workers=2, chunksize=1))
+        self.assertEqual([result[0] for result in pool], [0, 1, 2, 3])
+        self.assertEqual(here, pool)
+        for index, puzzle, solution, __ in pool:
+            self.check(puzzle, solution)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,49 +10,214 @@ Email:   fras2560@mylaurier.ca
 Version: 2014-10-07
 -------------------------------------------------------
 """
-import networkx as nx
+from array import array
 import logging
+import time
+try:
+    import networkx as nx
+except ImportError:
+    # networkx is only needed to export the graph (see to_networkx)
+    nx = None
+from solver.topology import get_topology
+from solver.trace import Event, PLACE, ELIMINATE
+from solver.stats import Stats
+
+# the moves make_move can play
+OBVIOUS = "obvious"
+TWO_COLOR = "two color"
+THREE_COLOR = "three color"
+HIDDEN_SINGLE = "hidden single"
+NAKED_SUBSET = "naked subset"
+LOCKED_CANDIDATES = "locked candidates"
+# the names of the fish by size, larger ones are just fish
+FISH_NAMES = {2: "x-wing", 3: "swordfish", 4: "jellyfish"}
+SIMPLE_COLORING = "simple coloring"
+X_CHAIN = "x-chain"
+XY_WING = "xy-wing"
+# the tiers played once the nodes and singles are done (see play_tiers)
+SUBSETS = "subsets"
+FISH = "fish"
+CHAINS = "chains"
+TIERS = (SUBSETS, FISH, CHAINS)
+HIDDEN_SUBSET = "hidden subset"
+# the techniques from the cheapest with the grade of a puzzle that
+# needs them (see play_technique and Solver.rate), a puzzle that
+# needs a search is graded GUESS
+GUESS = "guess"
+LADDER = ((OBVIOUS, 1.0),
+          (HIDDEN_SINGLE, 1.5),
+          (TWO_COLOR, 2.0),
+          (THREE_COLOR, 2.5),
+          (LOCKED_CANDIDATES, 2.8),
+          (NAKED_SUBSET, 3.0),
+          (HIDDEN_SUBSET, 3.4),
+          (FISH_NAMES[2], 3.8),
+          (SIMPLE_COLORING, 4.2),
+          (FISH_NAMES[3], 4.6),
+          (XY_WING, 5.0),
+          (X_CHAIN, 5.5),
+          (FISH_NAMES[4], 6.0),
+          (GUESS, 8.0))
+
+def mask_to_colors(mask):
+    '''
+    a function that converts a color bitmask to a list of colors
+    Parameters:
+        mask: the bitmask of colors (int)
+    Returns:
+        colors: the colors set in the mask in ascending order (list)
+    '''
+    colors = []
+    color = 0
+    while mask:
+        if mask & 1:
+            colors.append(color)
+        mask >>= 1
+        color += 1
+    return colors
+
+def count_colors(mask):
+    '''
+    a function that counts the number of colors in a color bitmask
+    Parameters:
+        mask: the bitmask of colors (int)
+    Returns:
+        : the number of colors in the mask (int)
+    '''
+    return bin(mask).count("1")
+
+if hasattr(int, "bit_count"):
+    # python 3.10 counts the bits itself, much faster on large boards
+    count_colors = int.bit_count
+
+def find_subsets(masks, size):
+    '''
+    a function that finds every size masks whose union has size bits,
+    like the palettes of a naked subset or the places of a hidden one
+    Parameters:
+        masks: the bitmasks to choose from (list)
+        size: the number of masks to choose (int)
+    Returns:
+        found: a (indexes, union) tuple for each subset where indexes
+               are the positions of the chosen masks (list)
+    '''
+    found = []
+    small = [index for index, mask in enumerate(masks)
+             if count_colors(mask) <= size]
+
+    def extend(start, chosen, union):
+        for position in range(start, len(small)):
+            joined = union | masks[small[position]]
+            if count_colors(joined) > size:
+                continue
+            picked = chosen + (small[position],)
+            if len(picked) == size:
+                found.append((picked, joined))
+            else:
+                extend(position + 1, picked, joined)
+
+    extend(0, (), 0)
+    return found
+
+# the color of a node with no color in the colors array
+NO_COLOR = -1
+
+def mask_array(n, values):
+    '''
+    a function that makes a typed array for bitmasks of n bits
+    Parameters:
+        n: the number of bits (int)
+        values: the initial values (iterable)
+    Returns:
+        : an array of 4 byte items for up to 32 bits and 8 byte items
+          for up to 64, a list for more (array)
+    '''
+    if n <= 32:
+        return array("I", values)
+    if n <= 64:
+        return array("Q", values)
+    return list(values)
+
+def mask_to_color(mask):
+    '''
+    a function that gets the highest color of a color bitmask
+    Parameters:
+        mask: the bitmask of colors (int)
+    Returns:
+        : the color (int), only meaningful when one color is set
+    '''
+    return mask.bit_length() - 1
 
 class Graph():
     '''
     Graph
         a sudoku graph object
     '''
-    def __init__(self, n, logger=None):
+    def __init__(self, n, logger=None, box=None):
         '''
         constructor
             constructs a sudoku graph (n by n)
             Parameters:
                 n: the size of the graph (int)
+                box: the (rows, columns) shape of a box, None for the
+                     default shape (see topology.default_box) or False
+                     for no boxes (tuple)
         '''
-        self._graph = nx.Graph()
-        self.columns = n
-        self.rows = n
-        index = 0
-        while index < n:
-            inside_column = 0
-            # add all horizontal row
-            while inside_column < index:
-                self.add_node(Node(index, inside_column))
-                inside_column += 1
-            # add all vertical columns
-            inside_row = 0
-            while inside_row < index:
-                self.add_node(Node(inside_row, index))
-                inside_row += 1
-            self.add_node(Node(index, index))
-            index += 1
-        if n == 9:
-            # assume standard sudoku board
-            for row  in range(0, 9, 3):
-                for column in range(0, 9, 3):
-                    node_list = self.assemble_square(row, column)
-                    self.connect_node_list(node_list)
         if logger is None:
             logging.basicConfig(level=logging.INFO,
                             format='%(asctime)s %(message)s')
             logger = logging.getLogger(__name__)
         self.logger=logger
+        self.columns = n
+        self.rows = n
+        # the units and peers are shared by every graph of this shape
+        self.topology = get_topology(n, box)
+        # node state is indexed by node id, one byte for the color
+        # (NO_COLOR if none) and 4 for the available colors
+        size = n * n
+        self._colors = array("b", [NO_COLOR]) * size
+        self._masks = mask_array(n, [(1 << n) - 1] * size)
+        # the adjacency when edges are added outside of the topology
+        self._neighbors = None
+        # the node ids whose colors changed since the last pop_changed
+        self._changed = []
+        # the colors used by each unit and the number of times a color
+        # was set in a unit already using it
+        self._unit_used = mask_array(n, [0] * len(self.topology.units))
+        self._conflicts = 0
+        # the nodes of each unit that can still take each color,
+        # index unit_id * n + color holds a bitmask of unit positions
+        self._places = mask_array(n, [(1 << n) - 1] *
+                                  (len(self.topology.units) * n))
+        # the _places indexes left with one node (hidden singles)
+        self._singles = []
+        # the units whose colors changed since they were last searched
+        # for subsets and the largest subset searched for
+        self._dirty_units = bytearray([1]) * len(self.topology.units)
+        self.subset_limit = max(4, n // 2)
+        # the colors that lost places since fish were last looked for
+        # and the largest fish looked for
+        self._dirty_colors = (1 << n) - 1
+        self.fish_limit = 4
+        # for each color a bitmask of the units where it has exactly
+        # two places (the strong links) and the most nodes in a chain
+        self._strong_units = [0] * n
+        self.chain_limit = 8
+        # the undo trail, a (values, index, old value) entry for every
+        # change since the first mark or None when not recording
+        self._trail = None
+        # the tiers play_tiers tries in order
+        self.tiers = list(TIERS)
+        # a callable given an Event for every color placed or removed,
+        # None to trace nothing
+        self.trace = None
+        # the move being played
+        self._technique = None
+        # a Stats the moves are recorded to, None to record nothing
+        self.stats = None
+        # the number of colors removed and nodes colored so far
+        self._eliminations = 0
+        self._placements = 0
 
     def assemble_square(self, row, column):
         '''
@@ -62,19 +227,30 @@ class Graph():
             column: the column index (int)
         Returns
             node_list: a list of the node id that make the square (list)
+        Raises:
+            Exception: if the board has no squares
         '''
+        shape = self.box_shape()
+        if not shape:
+            raise Exception("Board of size %d has no squares" % self.rows)
+        box_rows, box_columns = shape
         node_list = []
-        node_list.append(column + self.columns * row)
-        node_list.append(column + self.columns * (row + 1))
-        node_list.append(column + self.columns * (row + 2))
-        node_list.append(column + 1 + self.columns * row)
-        node_list.append(column + 1 + self.columns * (row + 1))
-        node_list.append(column + 1 + self.columns * (row + 2))
-        node_list.append(column + 2 + self.columns * row)
-        node_list.append(column + 2 + self.columns * (row + 1))
-        node_list.append(column + 2 + self.columns * (row + 2))
+        for c in range(column, column + box_columns):
+            for r in range(row, row + box_rows):
+                node_list.append(c + self.columns * r)
         return node_list
 
+    def box_shape(self):
+        '''
+        a method that gets the shape of the squares (boxes) of the board
+        Parameters:
+            None
+        Returns:
+            : the (rows, columns) of a box (tuple) or False for a
+              board without boxes
+        '''
+        return self.topology.box
+
     def connect_node_list(self, nodes):
         '''
         a method that connect the node list together
@@ -89,28 +265,93 @@ class Graph():
         while len(nodes) > 0:
             source = nodes.pop()
             for target in nodes:
-                self._graph.add_edge(source, target)
+                self.add_edge(source, target)
         return
 
+    def add_edge(self, source, target):
+        '''
+        a method that connects two nodes
+        Parameters:
+            source: the first node id (int)
+            target: the second node id (int)
+        Returns:
+            none
+        '''
+        if self._neighbors is None:
+            self._neighbors = [dict.fromkeys(peers)
+                               for peers in self.topology.peers]
+        if source != target:
+            self._neighbors[source][target] = None
+            self._neighbors[target][source] = None
+
+    def neighbors(self, node_id):
+        '''
+        a method that gets the neighbors of a node
+        Parameters:
+            node_id: the node id (int)
+        Returns:
+            : an iterable of the neighboring node ids
+        '''
+        if self._neighbors is None:
+            return self.topology.peers[node_id]
+        return self._neighbors[node_id]
+
+    def to_networkx(self):
+        '''
+        a method that exports the graph to a networkx graph
+        Parameters:
+            None
+        Returns:
+            graph: the sudoku graph with each Node stored in
+                    the 'node' attribute (networkx.Graph)
+        Raises:
+            Exception: if networkx is not installed
+        '''
+        if nx is None:
+            raise Exception("networkx is required to export the graph")
+        graph = nx.Graph()
+        for node_id in range(len(self._colors)):
+            graph.add_node(node_id, node=self.get_node(node_id))
+        for node_id in range(len(self._colors)):
+            for neighbor in self.neighbors(node_id):
+                graph.add_edge(node_id, neighbor)
+        return graph
+
     def add_node(self, node):
         '''
-        a method that add a node to the graph and connects to nodes accordingly
+        a method that add a node to the graph, the node is connected
+        to the nodes of its units by the topology and its state is
+        played onto the graph (see set_node_color and remove_colors)
+        so the indexes and the trail stay in step
         Parameters:
             node: the node to add (Node)
         Returns:
             none
+        Raises:
+            Exception: if the node is outside the graph or the node
+                       of the graph is already colored
         '''
         row, column = node.get_index()
-        if row > self.rows or column > self.columns:
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
             raise Exception("Invalid Node")
         node_id = column + row * self.columns
-        self._graph.add_node(node_id, node=node)
-        # connect to all previous nodes in its column
-        for x in range(0, column):
-            self._graph.add_edge(node_id, x + row * self.columns)
-        # connect to all previous nodes in its row
-        for x in range(0, row):
-            self._graph.add_edge(node_id, column + x * self.columns)
+        if self._colors[node_id] != NO_COLOR:
+            raise Exception("Add a Node over a colored Node")
+        color = node.get_color()
+        if color is not None:
+            self.set_node_color(row, column, color)
+        else:
+            self.remove_colors(node_id, ~node.get_available_mask())
+
+    def get_node(self, node_id):
+        '''
+        a method that gets a node of the graph
+        Parameters:
+            node_id: the node id (int)
+        Returns:
+            : a view of the node on the state of the graph (Node)
+        '''
+        return Node.view(self, node_id)
 
     def set_node_color(self, row, column, color):
         '''
@@ -125,14 +366,614 @@ class Graph():
             Exception: if color is already set or color is not an int
         '''
         node_id = column + self.columns * row
-        nodes = nx.get_node_attributes(self._graph, 'node')
-        check = nodes[node_id].get_color()
-        if check is not None:
+        if self._colors[node_id] != NO_COLOR:
             raise Exception("Set a Node Color which already set")
-        nodes[node_id].set_color(color)
+        if type(color) is not int:
+            raise Exception("Node given non-int color")
+        palette = self._masks[node_id]
+        trail = self._trail
+        if trail is not None:
+            trail.append((self._colors, node_id, NO_COLOR))
+            trail.append((self._masks, node_id, palette))
+        self._colors[node_id] = color
+        self._masks[node_id] = 0
+        self._changed.append(node_id)
+        self._placements += 1
+        if self.trace is not None:
+            self.trace(Event(PLACE, (row, column), self._technique, [color]))
+        bit = 1 << color
+        unit_used = self._unit_used
+        for unit_id in self.topology.cell_units[node_id]:
+            if unit_used[unit_id] & bit:
+                self._conflicts += 1
+                self.logger.error("Invalid graph: (%d, %d) set to color %d"
+                                  " already in its unit", row, column, color)
+            if trail is not None:
+                trail.append((unit_used, unit_id, unit_used[unit_id]))
+            unit_used[unit_id] |= bit
+        self._drop_places(node_id, palette)
         # remove that color from his neighbor color palette 
-        for neighbor in self._graph.neighbors(node_id):
-            nodes[neighbor].remove_available_color(color)
+        for neighbor in self.neighbors(node_id):
+            self.remove_colors(neighbor, 1 << color)
+
+    def reset(self):
+        '''
+        a method that clears every color so the graph can be reused
+        Parameters:
+            None
+        Returns:
+            None
+        '''
+        n = self.columns
+        full = (1 << n) - 1
+        size = len(self._colors)
+        self._colors[:] = array("b", [NO_COLOR]) * size
+        self._masks[:] = mask_array(n, [full] * size)
+        self._changed = []
+        self._unit_used = mask_array(n, [0] * len(self._unit_used))
+        self._conflicts = 0
+        self._places = mask_array(n, [full] * len(self._places))
+        self._singles = []
+        self._dirty_units = bytearray([1]) * len(self._dirty_units)
+        self._dirty_colors = full
+        self._strong_units = [0] * len(self._strong_units)
+        self._trail = None
+
+    def load_grid(self, grid):
+        '''
+        a method that clears the graph and colors the nodes of a grid
+        in one pass, which is much quicker than setting the colors one
+        at a time, no events are traced and no moves are counted
+        Parameters:
+            grid: the rows of colors, ' ' or None for no color
+                  (the same format as to_list) (list)
+        Returns:
+            None
+        '''
+        n = self.columns
+        if self._neighbors is not None:
+            # the edges outside of the topology need set_node_color
+            self.reset()
+            for row, colors in enumerate(grid):
+                for column, color in enumerate(colors):
+                    if color is not None and color != " ":
+                        self.set_node_color(row, column, color)
+            return
+        topology = self.topology
+        colors = self._colors
+        colors[:] = array("b", [NO_COLOR]) * len(colors)
+        for row, line in enumerate(grid):
+            for column, color in enumerate(line):
+                if color is not None and color != " ":
+                    colors[column + n * row] = color
+        used = [0] * len(topology.units)
+        conflicts = 0
+        for unit_id, unit in enumerate(topology.units):
+            for node_id in unit:
+                if colors[node_id] != NO_COLOR:
+                    bit = 1 << colors[node_id]
+                    if used[unit_id] & bit:
+                        conflicts += 1
+                    used[unit_id] |= bit
+        full = (1 << n) - 1
+        masks = self._masks
+        for node_id, unit_ids in enumerate(topology.cell_units):
+            if colors[node_id] != NO_COLOR:
+                masks[node_id] = 0
+            else:
+                seen = 0
+                for unit_id in unit_ids:
+                    seen |= used[unit_id]
+                masks[node_id] = full & ~seen
+        self._conflicts = conflicts
+        self._rebuild()
+
+    def remove_colors(self, node_id, mask):
+        '''
+        a method that removes a set of colors from a node's palette
+        Parameters:
+            node_id: the node id (int)
+            mask: the bitmask of colors to remove (int)
+        Returns:
+            : True if any color was removed, False otherwise
+        '''
+        masks = self._masks
+        removed = masks[node_id] & mask
+        if removed:
+            if self._trail is not None:
+                self._trail.append((masks, node_id, masks[node_id]))
+            masks[node_id] ^= removed
+            self._drop_places(node_id, removed)
+            self._changed.append(node_id)
+            self._eliminations += count_colors(removed)
+            if self.trace is not None:
+                self.trace(Event(ELIMINATE, self.get_row_column(node_id),
+                                 self._technique, mask_to_colors(removed)))
+        return removed != 0
+
+    def _drop_places(self, node_id, removed):
+        '''
+        a method that removes a node from the places of the colors
+        it can no longer take, queues the hidden singles left and
+        keeps track of the units with two places left (strong links)
+        Parameters:
+            node_id: the node id (int)
+            removed: the bitmask of colors removed (int)
+        Returns:
+            None
+        '''
+        n = self.columns
+        places = self._places
+        topology = self.topology
+        dirty = self._dirty_units
+        strong = self._strong_units
+        trail = self._trail
+        self._dirty_colors |= removed
+        for unit_id, bit in zip(topology.cell_units[node_id],
+                                topology.cell_bits[node_id]):
+            dirty[unit_id] = 1
+            used = self._unit_used[unit_id]
+            base = unit_id * n
+            mask = removed
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                color = low.bit_length() - 1
+                left = places[base + color] & ~bit
+                if trail is not None:
+                    trail.append((places, base + color, places[base + color]))
+                    trail.append((strong, color, strong[color]))
+                places[base + color] = left
+                # places only shrink so a unit has two places once
+                rest = left & (left - 1)
+                if rest:
+                    if not rest & (rest - 1):
+                        strong[color] |= 1 << unit_id
+                else:
+                    strong[color] &= ~(1 << unit_id)
+                    if left and not used & low:
+                        self._singles.append(base + color)
+
+    def play_hidden_singles(self):
+        '''
+        a method that colors every node that is the only place left
+        for a color in one of its units, whatever its number of colors
+        Parameters:
+            None
+        Returns:
+            : True if a node was colored, False otherwise
+        '''
+        if not self._singles:
+            return False
+        return self._play(HIDDEN_SINGLE, self._place_singles)
+
+    def _place_singles(self, first=False):
+        '''
+        a method that colors the nodes of the queued hidden singles
+        Parameters:
+            first: True to stop after the first node colored (boolean)
+        Returns:
+            move: True if a node was colored
+                  False otherwise
+        '''
+        singles = self._singles
+        n = self.columns
+        places = self._places
+        units = self.topology.units
+        move = False
+        while singles:
+            index = singles.pop()
+            unit_id, color = divmod(index, n)
+            left = places[index]
+            if (left == 0 or left & (left - 1) or
+                    self._unit_used[unit_id] & (1 << color)):
+                # stale, the color was placed or lost its last node
+                continue
+            node_id = units[unit_id][mask_to_color(left)]
+            row, column = self.get_row_column(node_id)
+            self.set_node_color(row, column, color)
+            move = True
+            if first:
+                break
+        return move
+
+    def play_subsets(self):
+        '''
+        a method that looks for naked and hidden subsets in every unit
+        that changed since it was last looked at
+        Parameters:
+            None
+        Returns:
+            move: True if a color was removed
+                  False otherwise
+        '''
+        dirty = self._dirty_units
+        move = False
+        for unit_id in range(len(dirty)):
+            if dirty[unit_id]:
+                dirty[unit_id] = 0
+                move = self._play(NAKED_SUBSET, self.naked_subset_move,
+                                  unit_id) or move
+                move = self._play(HIDDEN_SUBSET, self.hidden_subset_move,
+                                  unit_id) or move
+        return move
+
+    def play_fish(self):
+        '''
+        a method that looks for fish of every size up to fish_limit
+        for the colors that lost places since it was last called
+        Parameters:
+            None
+        Returns:
+            move: True if a color was removed
+                  False otherwise
+        '''
+        dirty = self._dirty_colors
+        self._dirty_colors = 0
+        move = False
+        for color in mask_to_colors(dirty):
+            for size in range(2, self.fish_limit + 1):
+                technique = FISH_NAMES.get(size, FISH)
+                move = self._play(technique, self.fish_move, color,
+                                  size) or move
+        return move
+
+    def play_chains(self):
+        '''
+        a method that plays the chain techniques from the simplest,
+        stopping at the first that removes a color
+        Parameters:
+            None
+        Returns:
+            : True if a color was removed, False otherwise
+        '''
+        for technique, move in ((SIMPLE_COLORING, self.coloring_move),
+                                (X_CHAIN, self.x_chain_move)):
+            for color in range(self.columns):
+                if self._strong_units[color] and \
+                        self._play(technique, move, color):
+                    return True
+        return self._play(XY_WING, self.xy_wing_move)
+
+    def play_tiers(self):
+        '''
+        a method that plays the tiers in order until one makes a move
+        Parameters:
+            None
+        Returns:
+            : True if a tier made a move, False otherwise
+        Raises:
+            Exception: if a tier is unknown
+        '''
+        for tier in self.tiers:
+            if tier == SUBSETS:
+                move = self.play_subsets()
+            elif tier == FISH:
+                move = self.play_fish()
+            elif tier == CHAINS:
+                move = self.play_chains()
+            else:
+                raise Exception("Unknown tier: %s" % tier)
+            if move:
+                return True
+        return False
+
+    def play_technique(self, technique):
+        '''
+        a method that plays one technique of the LADDER anywhere on
+        the board, stopping at the first node, unit or color it makes
+        a move on
+        Parameters:
+            technique: the name of the technique (str)
+        Returns:
+            : True if a move was made, False otherwise
+        Raises:
+            Exception: if the technique is not on the ladder
+        '''
+        n = self.columns
+        masks = self._masks
+        if technique == HIDDEN_SINGLE:
+            if not self._singles:
+                return False
+            return self._play(HIDDEN_SINGLE, self._place_singles, True)
+        nodes = {OBVIOUS: (self.obvious_move, 1, 1),
+                 TWO_COLOR: (self.two_color_move, 2, 2),
+                 THREE_COLOR: (self.three_color_move, 3, 3),
+                 LOCKED_CANDIDATES: (self.locked_candidates_move, 2, n)}
+        if technique in nodes:
+            move, fewest, most = nodes[technique]
+            for node_id, mask in enumerate(masks):
+                if (fewest <= count_colors(mask) <= most and
+                        self._play(technique, move, node_id)):
+                    return True
+            return False
+        if technique in (NAKED_SUBSET, HIDDEN_SUBSET):
+            move = self.naked_subset_move
+            if technique == HIDDEN_SUBSET:
+                move = self.hidden_subset_move
+            for unit_id in range(len(self.topology.units)):
+                if self._play(technique, move, unit_id):
+                    return True
+            return False
+        for size, name in FISH_NAMES.items():
+            if technique == name:
+                for color in range(n):
+                    if self._play(technique, self.fish_move, color, size):
+                        return True
+                return False
+        if technique in (SIMPLE_COLORING, X_CHAIN):
+            move = self.coloring_move
+            if technique == X_CHAIN:
+                move = self.x_chain_move
+            for color in range(n):
+                if self._strong_units[color] and \
+                        self._play(technique, move, color):
+                    return True
+            return False
+        if technique == XY_WING:
+            return self._play(XY_WING, self.xy_wing_move)
+        raise Exception("Unknown technique: %s" % technique)
+
+    def _play(self, technique, move, *args):
+        '''
+        a method that plays a move as a technique, recording it
+        to the trace and the stats
+        Parameters:
+            technique: the name of the technique (str)
+            move: the method making the move, returning True if it did
+            args: the arguments of the move
+        Returns:
+            result: the result of the move (boolean)
+        '''
+        stats = self.stats
+        self._technique = technique
+        if stats is None:
+            result = move(*args)
+        else:
+            start = time.perf_counter()
+            eliminations = self._eliminations
+            placements = self._placements
+            result = move(*args)
+            stats.record(technique, result,
+                         self._eliminations - eliminations,
+                         self._placements - placements,
+                         time.perf_counter() - start)
+        self._technique = None
+        return result
+
+    def pop_changed(self):
+        '''
+        a method that gets the nodes that changed since the last call
+        Parameters:
+            None
+        Returns:
+            changed: the node ids that were colored or lost
+                     available colors, may repeat (list)
+        '''
+        changed = self._changed
+        self._changed = []
+        return changed
+
+    def get_color_count(self, node_id):
+        '''
+        a method that counts the available colors of a node
+        Parameters:
+            node_id: the node id (int)
+        Returns:
+            : the number of available colors (int)
+        '''
+        return count_colors(self._masks[node_id])
+
+    def is_solved(self):
+        '''
+        a method that checks if every node is colored
+        Parameters:
+            None
+        Returns:
+            True if every node has a color
+            False otherwise
+        '''
+        return NO_COLOR not in self._colors
+
+    def has_contradiction(self):
+        '''
+        a method that checks if some node can no longer be colored
+        Parameters:
+            None
+        Returns:
+            True if an uncolored node has no available colors
+            False otherwise
+        '''
+        for color, mask in zip(self._colors, self._masks):
+            if color == NO_COLOR and mask == 0:
+                return True
+        return False
+
+    def get_fewest_colors_node(self):
+        '''
+        a method that finds the uncolored node with the fewest
+        available colors (minimum remaining values)
+        Parameters:
+            None
+        Returns:
+            best: the node id or None if every node is colored (int)
+        '''
+        best = None
+        fewest = None
+        masks = self._masks
+        for node_id, color in enumerate(self._colors):
+            if color == NO_COLOR:
+                count = count_colors(masks[node_id])
+                if fewest is None or count < fewest:
+                    best = node_id
+                    fewest = count
+                    if count <= 1:
+                        break
+        return best
+
+    def snapshot(self):
+        '''
+        a method that saves the colors and palettes of the nodes
+        Parameters:
+            None
+        Returns:
+            : the saved state to give to restore, the colors and
+              palettes as bytes (tuple)
+        '''
+        masks = self._masks
+        if isinstance(masks, list):
+            masks = tuple(masks)
+        else:
+            masks = masks.tobytes()
+        return (self._colors.tobytes(), masks, self._conflicts)
+
+    def restore(self, state):
+        '''
+        a method that restores the nodes to a saved state, the indexes
+        of the places, used colors and strong links are rebuilt
+        Parameters:
+            state: a state returned by snapshot (tuple)
+        Returns:
+            None
+        '''
+        colors, masks, conflicts = state
+        # the arrays are filled in place so views of nodes stay valid
+        self._colors[:] = array("b", colors)
+        if isinstance(masks, tuple):
+            self._masks[:] = list(masks)
+        else:
+            saved = array(self._masks.typecode)
+            saved.frombytes(masks)
+            self._masks[:] = saved
+        self._conflicts = conflicts
+        self._rebuild()
+
+    def _rebuild(self):
+        '''
+        a method that rebuilds the indexes from the colors and palettes
+        Parameters:
+            None
+        Returns:
+            None
+        '''
+        n = self.columns
+        topology = self.topology
+        colors = self._colors
+        masks = self._masks
+        unit_used = mask_array(n, [0] * len(topology.units))
+        places = mask_array(n, [0] * (len(topology.units) * n))
+        for unit_id, unit in enumerate(topology.units):
+            base = unit_id * n
+            for position, node_id in enumerate(unit):
+                if colors[node_id] != NO_COLOR:
+                    unit_used[unit_id] |= 1 << colors[node_id]
+                for color in mask_to_colors(masks[node_id]):
+                    places[base + color] |= 1 << position
+        self._unit_used = unit_used
+        self._places = places
+        self._singles = []
+        self._strong_units = [0] * n
+        for index, left in enumerate(places):
+            unit_id, color = divmod(index, n)
+            count = count_colors(left)
+            if count == 2:
+                self._strong_units[color] |= 1 << unit_id
+            elif count == 1 and not unit_used[unit_id] & (1 << color):
+                self._singles.append(index)
+        self._changed = []
+        self._dirty_units = bytearray([1]) * len(topology.units)
+        self._dirty_colors = (1 << n) - 1
+        self._trail = None
+
+    def mark(self):
+        '''
+        a method that starts recording the changes to the graph, if it
+        was not already, and marks the current state to undo back to
+        Parameters:
+            None
+        Returns:
+            : the mark to give to undo (tuple)
+        '''
+        if self._trail is None:
+            self._trail = []
+        return (len(self._trail), self._conflicts, tuple(self._singles),
+                bytes(self._dirty_units), self._dirty_colors)
+
+    def undo(self, mark):
+        '''
+        a method that undoes the changes made since a mark, which
+        takes as long as the number of changes
+        Parameters:
+            mark: a mark returned by mark (tuple)
+        Returns:
+            None
+        '''
+        length, conflicts, singles, dirty_units, dirty_colors = mark
+        trail = self._trail
+        while len(trail) > length:
+            values, index, old = trail.pop()
+            values[index] = old
+        self._conflicts = conflicts
+        self._singles = list(singles)
+        self._dirty_units = bytearray(dirty_units)
+        self._dirty_colors = dirty_colors
+        self._changed = []
+
+    def stop_trail(self):
+        '''
+        a method that stops recording the changes, the marks made
+        so far can no longer be undone
+        Parameters:
+            None
+        Returns:
+            None
+        '''
+        self._trail = None
+
+    def copy(self):
+        '''
+        a method that copies the graph to work on a branch apart,
+        the copy shares the topology, logger and settings but not the
+        trace, the stats or the trail
+        Parameters:
+            None
+        Returns:
+            graph: the copy (Graph)
+        '''
+        graph = Graph.__new__(Graph)
+        graph.__dict__.update(self.__dict__)
+        graph._colors = self._colors[:]
+        graph._masks = self._masks[:]
+        if self._neighbors is not None:
+            graph._neighbors = [dict(x) for x in self._neighbors]
+        graph._changed = []
+        graph._unit_used = self._unit_used[:]
+        graph._places = self._places[:]
+        graph._singles = list(self._singles)
+        graph._dirty_units = bytearray(self._dirty_units)
+        graph._strong_units = list(self._strong_units)
+        graph.tiers = list(self.tiers)
+        graph.trace = None
+        graph.stats = None
+        graph._trail = None
+        return graph
+
+    def board_bytes(self):
+        '''
+        a method that gets the size of the state of the nodes, one byte
+        for the color and the item size of the masks for the palette
+        of each node, the indexes of the units are not counted
+        Parameters:
+            None
+        Returns:
+            : the number of bytes (int)
+        '''
+        masks = self._masks
+        if isinstance(masks, list):
+            itemsize = (self.columns + 7) // 8
+        else:
+            itemsize = masks.itemsize
+        return len(self._colors) * (self._colors.itemsize + itemsize)
 
     def get_available_colors(self, row, column):
         '''
@@ -143,9 +984,30 @@ class Graph():
         Returns:
             : list of available colors (list)
         '''
-        node_id = column + self.columns * row
-        nodes = nx.get_node_attributes(self._graph, 'node')
-        return nodes[node_id].get_available_colors()
+        return mask_to_colors(self._masks[column + self.columns * row])
+
+    def get_node_color(self, row, column):
+        '''
+        a method that gets the color of one node
+        Parameters:
+            row: the row index (int)
+            column: the column index (int)
+        Returns:
+            : the color of the node or None if not colored (int)
+        '''
+        color = self._colors[column + self.columns * row]
+        return None if color == NO_COLOR else color
+
+    def get_available_mask(self, row, column):
+        '''
+        a method that finds the bitmask of available colors for one node
+        Parameters:
+            row: the row index (int)
+            column: the column index (int)
+        Returns:
+            : the bitmask of available colors (int)
+        '''
+        return self._masks[column + self.columns * row]
 
     def output(self):
         '''
@@ -155,15 +1017,15 @@ class Graph():
         Returns:
             None
         '''
-        nodes = nx.get_node_attributes(self._graph, 'node')
+        colors = self._colors
         index = 0
         line_end = self.columns
         end = self.columns * self.rows
         while line_end <= end:
             line = []
             while index < line_end:
-                color = nodes[index].get_color()
-                if color is not None:
+                color = colors[index]
+                if color != NO_COLOR:
                     line.append(str(color))
                 else:
                     line.append(" ")
@@ -181,14 +1043,14 @@ class Graph():
             square matrix of the sudoku board with the colored nodes
         '''
         result = []
-        nodes = nx.get_node_attributes(self._graph, 'node')
+        colors = self._colors
         row = 0
         while row < self.rows:
             result.append([])
             index = row* self.rows
             while index < self.columns * (row+1):
-                color = nodes[index].get_color()
-                if color is not None:
+                color = colors[index]
+                if color != NO_COLOR:
                     result[row].append(color)
                 else:
                     result[row].append(" ")
@@ -196,234 +1058,484 @@ class Graph():
             row += 1
         return result
 
-    def get_nodes(self):
+    def get_nodes(self):
+        '''
+        a getter function for the Graphs' nodes
+        Parameters:
+            None
+        Returns:
+            a list of graph node ids (list)
+        '''
+        return list(range(len(self._colors)))
+
+    def same_square(self, c1,c2,r1,r2):
+        '''
+        a method that determines if the values given are in the same square
+        Parameters:
+            c1: the first column index
+            c2: the second column index
+            r1: the first row index
+            r2: the second row index
+        Returns:
+            True if in same square
+            False otherwise (always for a board without squares)
+        '''
+        shape = self.box_shape()
+        if not shape:
+            return False
+        box_rows, box_columns = shape
+        same = False
+        if (c1 // box_columns == c2 // box_columns and
+                r1 // box_rows == r2 // box_rows):
+            same = True
+        return same
+ 
+    def two_color_move(self, node_id):
+        '''
+        a method to use to make a move on a cell that only has two colors
+        Parameters:
+            node_id: the node identifier (int)
+        Returns:
+            move: True if able to make a move (a color was removed
+                  or the node was colored)
+                  False otherwise
+        '''
+        move = self.node_subset_move(node_id)
+        move = self.hidden_single_move(node_id) or move
+        return move
+
+    def three_color_move(self, node_id):
+        '''
+        a method that makes a move if the cell has three colors
+        Parameters:
+            node_id: the node identifier (int)
+        Returns:
+            move: True move was made (a color was removed
+                  or the node was colored)
+                  False otherwise
+        '''
+        move = self.node_subset_move(node_id)
+        move = self.hidden_single_move(node_id) or move
+        return move
+
+    def node_subset_move(self, node_id):
+        '''
+        a method that removes the colors of a node from its units when
+        the node and other nodes make a naked subset as large as its
+        palette, the other nodes can have any of its colors
+        like {1, 2, 3}, {1, 2} and {2, 3}
+        Parameters:
+            node_id: the node identifier (int)
+        Returns:
+            move: True if a color was removed
+                  False otherwise
+        '''
+        masks = self._masks
+        topology = self.topology
+        palette = masks[node_id]
+        size = count_colors(palette)
+        move = False
+        for unit_id in topology.cell_units[node_id]:
+            unit = topology.units[unit_id]
+            subset = [node_id]
+            for n_id in unit:
+                mask = masks[n_id]
+                if (n_id != node_id and count_colors(mask) > 1 and
+                        mask & ~palette == 0):
+                    subset.append(n_id)
+            if len(subset) >= size:
+                subset = subset[:size]
+                for n_id in unit:
+                    if n_id not in subset:
+                        move = self.remove_colors(n_id, palette) or move
+        return move
+
+    def naked_subset_move(self, unit_id):
+        '''
+        a method that finds the nodes of a unit whose palettes together
+        have as many colors as there are nodes and removes those colors
+        from the rest of the unit
+        Parameters:
+            unit_id: the unit identifier (int)
+        Returns:
+            move: True if a color was removed
+                  False otherwise
+        '''
+        masks = self._masks
+        node_ids = []
+        palettes = []
+        for node_id in self.topology.units[unit_id]:
+            mask = masks[node_id]
+            if mask:
+                node_ids.append(node_id)
+                palettes.append(mask)
+        move = False
+        for size in range(2, min(self.subset_limit, len(palettes) // 2) + 1):
+            for chosen, colors in find_subsets(palettes, size):
+                for index, node_id in enumerate(node_ids):
+                    if index not in chosen:
+                        move = self.remove_colors(node_id, colors) or move
+        return move
+
+    def hidden_subset_move(self, unit_id):
+        '''
+        a method that finds the colors of a unit that together have
+        as many places as there are colors and removes the other colors
+        from those places
+        Parameters:
+            unit_id: the unit identifier (int)
+        Returns:
+            move: True if a color was removed
+                  False otherwise
+        '''
+        n = self.columns
+        base = unit_id * n
+        used = self._unit_used[unit_id]
+        colors = []
+        spots = []
+        for color in range(n):
+            places = self._places[base + color]
+            if places and not used & (1 << color):
+                colors.append(color)
+                spots.append(places)
+        unit = self.topology.units[unit_id]
+        masks = self._masks
+        move = False
+        for size in range(2, min(self.subset_limit, len(spots) // 2) + 1):
+            for chosen, places in find_subsets(spots, size):
+                keep = 0
+                for index in chosen:
+                    keep |= 1 << colors[index]
+                for position in mask_to_colors(places):
+                    node_id = unit[position]
+                    others = masks[node_id] & ~keep
+                    move = self.remove_colors(node_id, others) or move
+        return move
+
+    def hidden_single_move(self, node_id):
+        '''
+        a method that colors the node if only one of its colors
+        is missing from the colors of its row, column or square
+        Parameters:
+            node_id: the node identifier (int)
+        Returns:
+            move: True if move was made
+                  False otherwise
+        '''
+        n = self.columns
+        places = self._places
+        topology = self.topology
+        palette = self._masks[node_id]
+        colors = mask_to_colors(palette)
+        for unit_id, bit in zip(topology.cell_units[node_id],
+                                topology.cell_bits[node_id]):
+            base = unit_id * n
+            expect = 0
+            for color in colors:
+                if places[base + color] == bit:
+                    expect |= 1 << color
+            if count_colors(expect) == 1:
+                row, column = self.get_row_column(node_id)
+                self.set_node_color(row, column, mask_to_color(expect))
+                return True
+        return False
+
+    def a_not_in_b(self, a, b):
+        '''
+        a method that check fors any elements from a not in b
+        Parameters:
+            a: a list of elements (list)
+            b: a list of element (list)
+        Returns:
+            result: the elements from a not in b (list)
+        '''
+        result = []
+        for x in a:
+            if x not in b:
+                result.append(x)
+        return result
+
+    def obvious_move(self, node_id):
+        '''
+        a method that colors a node with its only color
+        Parameters:
+            node_id: the node identifier (int)
+        Returns:
+            True
+        '''
+        row, column = self.get_row_column(node_id)
+        palette = self._masks[node_id]
+        self.set_node_color(row, column, mask_to_color(palette))
+        return True
+
+    def locked_candidates_move(self, node_id):
+        '''
+        a method that removes the colors of a node that are locked in
+        the intersection of its box and one of its lines
+        pointing: the color only fits the box in that line, so the
+                  rest of the line loses it
+        claiming: the color only fits the line in that box, so the
+                  rest of the box loses it
+        Parameters:
+            node_id: the node identifier (int)
+        Returns:
+            move: True if a color was removed
+                  False otherwise
+        '''
+        n = self.columns
+        places = self._places
+        units = self.topology.units
+        colors = mask_to_colors(self._masks[node_id])
+        move = False
+        for line_id, box_id, line_mask, box_mask in \
+                self.topology.cell_intersections[node_id]:
+            for color in colors:
+                bit = 1 << color
+                box_places = places[box_id * n + color]
+                line_places = places[line_id * n + color]
+                if box_places & ~box_mask == 0:
+                    for position in mask_to_colors(line_places & ~line_mask):
+                        move = self.remove_colors(units[line_id][position],
+                                                  bit) or move
+                elif line_places & ~line_mask == 0:
+                    for position in mask_to_colors(box_places & ~box_mask):
+                        move = self.remove_colors(units[box_id][position],
+                                                  bit) or move
+        return move
+
+    def fish_move(self, color, size):
         '''
-        a getter function for the Graphs' nodes
+        a method that finds size rows whose places for a color fit in
+        size columns and removes the color from the rest of those
+        columns, then the same with the rows and columns swapped
+        (size 2 is an x-wing, 3 a swordfish and 4 a jellyfish)
         Parameters:
-            None
+            color: the color (int)
+            size: the number of rows (or columns) of the fish (int)
         Returns:
-            a list of graph nodes (list)
+            move: True if a color was removed
+                  False otherwise
         '''
-        return self._graph.nodes()
+        n = self.columns
+        bit = 1 << color
+        places = self._places
+        used = self._unit_used
+        units = self.topology.units
+        move = False
+        # the row units are 0 to n - 1 and the column units n to 2n - 1,
+        # the position of a node in a row is its column and vice versa
+        for base, cover in ((0, n), (n, 0)):
+            lines = []
+            masks = []
+            for line in range(n):
+                mask = places[(base + line) * n + color]
+                if mask and not used[base + line] & bit:
+                    lines.append(line)
+                    masks.append(mask)
+            if size > len(masks) // 2:
+                continue
+            for chosen, crossed in find_subsets(masks, size):
+                fish = 0
+                for index in chosen:
+                    fish |= 1 << lines[index]
+                for cross in mask_to_colors(crossed):
+                    unit_id = cover + cross
+                    others = places[unit_id * n + color] & ~fish
+                    for position in mask_to_colors(others):
+                        move = self.remove_colors(units[unit_id][position],
+                                                  bit) or move
+        return move
 
-    def same_square(self, c1,c2,r1,r2):
+    def sees(self, a, b):
         '''
-        a method that determines if the values given are in the same square
+        a method that checks if two nodes share a unit
         Parameters:
-            c1: the first column index
-            c2: the second column index
-            r1: the first row index
-            r2: the second row index
+            a: the first node id (int)
+            b: the second node id (int)
         Returns:
-            True if in same square
+            True if different nodes in the same row, column or box
             False otherwise
         '''
-        same = False
-        if (c1 // 3 == c2 // 3) and (r1 // 3 == r2 // 3):
-            same = True
-        return same
- 
-    def two_color_move(self, node_id):
+        return b in self.topology.peer_sets[a]
+
+    def strong_links(self, color):
         '''
-        a method to use to make a move on a cell that only has two colors
+        a method that builds the strong link graph of a color, two nodes
+        are strongly linked when they are the only places of the color
+        in a unit so one of them has to take it
         Parameters:
-            node_id: the node identifier (int)
+            color: the color (int)
+        Returns:
+            links: the strongly linked node ids of each node (dict)
+        '''
+        n = self.columns
+        units = self.topology.units
+        links = {}
+        for unit_id in mask_to_colors(self._strong_units[color]):
+            a, b = mask_to_colors(self._places[unit_id * n + color])
+            a = units[unit_id][a]
+            b = units[unit_id][b]
+            links.setdefault(a, []).append(b)
+            links.setdefault(b, []).append(a)
+        return links
+
+    def _record_chain(self, length):
+        '''
+        a method that records the number of nodes of a chain that
+        removed a color
+        Parameters:
+            length: the number of nodes in the chain (int)
+        Returns:
+            None
+        '''
+        if self.stats is not None:
+            self.stats.record_chain(length)
+
+    def _remove_seen(self, color, seen_by, skip=()):
+        '''
+        a method that removes a color from the nodes that see
+        every node of a list
+        Parameters:
+            color: the color (int)
+            seen_by: the node ids that must be seen (list)
+            skip: the node ids to keep the color (tuple)
         Returns:
-            move: True if able to make a move
+            move: True if a color was removed
                   False otherwise
         '''
-        row, column = self.get_row_column(node_id)
-        nodes = nx.get_node_attributes(self._graph, 'node')
-        palette = nodes[node_id].get_available_colors()
+        bit = 1 << color
+        masks = self._masks
         move = False
-        square_colors = []
-        row_colors = []
-        column_colors = []
-        naked_pair = None
-        for neighbor in self._graph.neighbors(node_id):
-            n_palette = nodes[neighbor].get_available_colors()
-            n_row, n_column = self.get_row_column(neighbor)
-            if n_palette == palette:
-                naked_pair = neighbor
-            self.logger.debug("(%d, %d)'s Palette - %s"
-                              %(n_row, n_column, self.list_to_string(n_palette)))
-            if column == n_column:
-                column_colors += n_palette
-            elif row == n_row:
-                row_colors += n_palette
-            if self.same_square(n_column, column, n_row, row):
-                # must be in same square
-                square_colors += n_palette
-        if naked_pair is not None:
-            # found a naked pair
-            move = True
-            n_row, n_column = self.get_row_column(naked_pair)
-            c1 = palette[1]
-            c2 = palette[0]
-            pair = [naked_pair, node_id]
-            if n_row == row:
-                # share row
-                for c in range(0, self.columns):
-                    n_id = self.get_node_id(row, c)
-                    if n_id not in pair:
-                        nodes[n_id].remove_available_color(c1)
-                        nodes[n_id].remove_available_color(c2)
-            elif n_column == column:
-                # share column
-                for r in range(0, self.rows):
-                    n_id = self.get_node_id(r, column)
-                    if n_id not in pair:
-                        n = nodes[n_id]
-                        n.remove_available_color(c1)
-                        n.remove_available_color(c2)
-            if self.same_square(column, n_column, n_row,row):
-                # share square
-                r = row - (row % 3)
-                c = column - (column % 3)
-                square = self.assemble_square(r, c)
-                for node in square:
-                    if node not in pair:
-                        nodes[node].remove_available_color(c1)
-                        nodes[node].remove_available_color(c2)
-        expect = self.a_not_in_b(palette, row_colors)
-        if len(expect) == 1:
-            self.logger.debug("Row Move:(%d,%d)" %(row,column))
-            self.set_node_color(row, column, expect[0])
-            move = True
-        else:
-            expect = self.a_not_in_b(palette, column_colors)
-            if len(expect) == 1:
-                self.logger.debug("Column Move:(%d,%d)" %(row,column))
-                self.set_node_color(row, column, expect[0])
-                move = True
-            else:
-                expect = self.a_not_in_b(palette, square_colors)
-                if len(expect) == 1:
-                    self.logger.debug("Square Move:(%d,%d)" %(row,column))
-                    self.set_node_color(row, column, expect[0])
-                    move = True
+        for node_id in self.topology.peers[seen_by[0]]:
+            if (masks[node_id] & bit and
+                    node_id not in skip and
+                    all(self.sees(node_id, x) for x in seen_by[1:])):
+                move = self.remove_colors(node_id, bit) or move
         return move
 
-    def three_color_move(self, node_id):
+    def coloring_move(self, color):
         '''
-        a method that makes a move if the cell has three colors
+        a method that plays simple coloring on a color, the nodes of
+        each group of strong links take the color in turns
+        wrap: two nodes of the same turn see each other so no node
+              of that turn takes the color
+        trap: a node that sees both turns can not take the color
         Parameters:
-            node_id: the node identifier (int)
+            color: the color (int)
         Returns:
-            move: True move was made
+            move: True if a color was removed
                   False otherwise
         '''
-        row, column = self.get_row_column(node_id)
-        nodes = nx.get_node_attributes(self._graph, 'node')
-        palette = nodes[node_id].get_available_colors()
+        links = self.strong_links(color)
+        bit = 1 << color
+        turn = {}
         move = False
-        square_colors = []
-        row_colors = []
-        column_colors = []
-        naked_row = []
-        naked_column = []
-        naked_square = []
-        naked_trio = None
-        for neighbor in self._graph.neighbors(node_id):
-            n_palette = nodes[neighbor].get_available_colors()
-            n_row, n_column = self.get_row_column(neighbor)
-            self.logger.debug("(%d, %d)'s Palette - %s"
-                              %(n_row, n_column, self.list_to_string(n_palette)))
-            if column == n_column:
-                column_colors += n_palette
-                naked_trio = naked_column
-            elif row == n_row:
-                row_colors += n_palette
-                naked_trio = naked_row
-            if self.same_square(column, n_column, row, n_row):
-                self.logger.debug("Same Square")
-                square_colors += n_palette
-                if n_palette == palette:
-                    naked_square.append(neighbor)
-                    if len(naked_square) == 2:
-                        move = True
-            if n_palette == palette:
-                naked_trio.append(neighbor)
-                if len(naked_trio) == 2:
-                    move = True
-        if move:
-            # found a naked trio
-            move = True
-            c1 = palette[1]
-            c2 = palette[0]
-            c3 = palette[2]
-            if len(naked_square) == 2:
-                naked_trio = naked_square
-                # share square
-                naked_square.append(node_id)
-                self.logger.debug("Naked Trio Share Square: %s" %
-                                  (self.list_to_string(naked_square)))
-                r = row - (row % 3)
-                c = column - (column % 3)
-                square = self.assemble_square(r, c)
-                for node in square:
-                    if node not in naked_square: 
-                        nodes[node].remove_available_color(c1)
-                        nodes[node].remove_available_color(c2)
-                        nodes[node].remove_available_color(c3)
-            n_row, n_column = self.get_row_column(naked_trio[0])
-            if len(naked_row) == 2:
-                # share row
-                naked_row.append(node_id)
-                self.logger.debug("Naked Trio Share Row: %s" %
-                                  (self.list_to_string(naked_row)))
-                for c in range(0, self.columns):
-                    n_id = self.get_node_id(n_row, c)
-                    if n_id not in naked_row:
-                        nodes[n_id].remove_available_color(c1)
-                        nodes[n_id].remove_available_color(c2)
-                        nodes[n_id].remove_available_color(c3)
-            elif len(naked_column) == 2:
-                # share square
-                naked_column.append(node_id)
-                self.logger.debug("Naked Trio Share Column: %s" %
-                                  (self.list_to_string(naked_square)))
-                for r in range(0, self.rows):
-                    n_id = self.get_node_id(r, n_column)
-                    self.logger.debug(n_id)
-                    if n_id not in naked_column:
-                        n = nodes[n_id]
-                        n.remove_available_color(c1)
-                        n.remove_available_color(c2)
-                        n.remove_available_color(c3)
-        expect = self.a_not_in_b(palette, row_colors)
-        if len(expect) == 1:
-            self.logger.debug("Row Move:(%d,%d)" %(row,column))
-            self.set_node_color(row, column, expect[0])
-            move = True
-        else:
-            expect = self.a_not_in_b(palette, column_colors)
-            if len(expect) == 1:
-                self.logger.debug("Column Move:(%d,%d)" %(row,column))
-                self.set_node_color(row, column, expect[0])
+        for start in links:
+            if start in turn:
+                continue
+            turn[start] = 0
+            groups = ([start], [])
+            stack = [start]
+            while stack:
+                node_id = stack.pop()
+                for other in links[node_id]:
+                    if other not in turn:
+                        turn[other] = 1 - turn[node_id]
+                        groups[turn[other]].append(other)
+                        stack.append(other)
+            length = len(groups[0]) + len(groups[1])
+            for group in groups:
+                if any(self.sees(a, b) for index, a in enumerate(group)
+                       for b in group[index + 1:]):
+                    for node_id in group:
+                        self.remove_colors(node_id, bit)
+                    self._record_chain(length)
+                    return True
+            trapped = False
+            for node_id in set(x for a in groups[0]
+                               for x in self.topology.peers[a]):
+                if (node_id not in turn and
+                        self._masks[node_id] & bit and
+                        any(self.sees(node_id, b) for b in groups[1])):
+                    trapped = self.remove_colors(node_id, bit) or trapped
+            if trapped:
+                self._record_chain(length)
                 move = True
-            else:
-                expect = self.a_not_in_b(palette, square_colors)
-                if len(expect) == 1:
-                    self.logger.debug("Square Move:(%d,%d)" %(row,column))
-                    self.set_node_color(row, column, expect[0])
-                    move = True
         return move
 
-    def a_not_in_b(self, a, b):
+    def x_chain_move(self, color):
         '''
-        a method that check fors any elements from a not in b
+        a method that looks for a chain of nodes of a color linked in
+        turns by strong and weak links (nodes in a unit), starting and
+        ending with a strong link, one of its ends takes the color so
+        the nodes seeing both ends can not
+        the chains have at most chain_limit nodes
         Parameters:
-            a: a list of elements (list)
-            b: a list of element (list)
+            color: the color (int)
         Returns:
-            result: the elements from a not in b (list)
+            : True if a color was removed, False otherwise
         '''
-        result = []
-        for x in a:
-            if x not in b:
-                result.append(x)
-        return result
+        links = self.strong_links(color)
+        limit = self.chain_limit
+        # the linked nodes each linked node sees, found as needed
+        weak_links = {}
+
+        def extend(chain):
+            start = chain[0]
+            end = chain[-1]
+            if len(chain) >= 4 and not self.sees(start, end) and \
+                    self._remove_seen(color, [start, end], chain):
+                self._record_chain(len(chain))
+                return True
+            if len(chain) + 2 > limit:
+                return False
+            if end not in weak_links:
+                weak_links[end] = [x for x in links if self.sees(end, x)]
+            for weak in weak_links[end]:
+                if weak not in chain:
+                    for strong in links[weak]:
+                        if strong not in chain and \
+                                extend(chain + (weak, strong)):
+                            return True
+            return False
+
+        for start in links:
+            for end in links[start]:
+                if extend((start, end)):
+                    return True
+        return False
+
+    def xy_wing_move(self):
+        '''
+        a method that looks for a node with colors {x, y} seeing a node
+        with {x, z} and one with {y, z}, either wing has z so the
+        nodes seeing both wings can not
+        Parameters:
+            None
+        Returns:
+            : True if a color was removed, False otherwise
+        '''
+        masks = self._masks
+        peers = self.topology.peers
+        pairs = [node_id for node_id, mask in enumerate(masks)
+                 if count_colors(mask) == 2]
+        for pivot in pairs:
+            palette = masks[pivot]
+            wings = [x for x in peers[pivot]
+                     if count_colors(masks[x]) == 2 and
+                     count_colors(masks[x] & palette) == 1]
+            for index, a in enumerate(wings):
+                mask_a = masks[a]
+                for b in wings[index + 1:]:
+                    mask_b = masks[b]
+                    shared = mask_a & mask_b
+                    if (count_colors(shared) == 1 and not shared & palette
+                            and mask_a & palette != mask_b & palette and
+                            self._remove_seen(mask_to_color(shared),
+                                              [a, b], (a, b))):
+                        self._record_chain(3)
+                        return True
+        return False
 
     def make_move(self, row, column):
         '''
@@ -435,25 +1547,18 @@ class Graph():
             True if move was available
             False otherwise
         '''
-        nodes = nx.get_node_attributes(self._graph, 'node')
         node_id = self.get_node_id(row, column)
-        palette = nodes[node_id].get_available_colors()
-        number_colors = len(palette)
+        number_colors = self.get_color_count(node_id)
         move = False
-        if number_colors != 0:
-            if number_colors == 1:
-                self.logger.info("Obvious Move: (%d, %d)"
-                                 % self.get_row_column(node_id))
-                move = True
-                self.set_node_color(row, column, palette[0])
-            elif number_colors == 2:
-                self.logger.info("Two Color Move: (%d, %d) "
-                                 % self.get_row_column(node_id))
-                move = self.two_color_move(node_id)
-            elif number_colors == 3:
-                self.logger.info("Three Color Move: (%d, %d)"
-                                 % self.get_row_column(node_id))
-                move = self.three_color_move(node_id)
+        if number_colors == 1:
+            move = self._play(OBVIOUS, self.obvious_move, node_id)
+        elif number_colors == 2:
+            move = self._play(TWO_COLOR, self.two_color_move, node_id)
+        elif number_colors == 3:
+            move = self._play(THREE_COLOR, self.three_color_move, node_id)
+        if not move and number_colors > 1:
+            move = self._play(LOCKED_CANDIDATES,
+                              self.locked_candidates_move, node_id)
         return move
 
     def log(self, output):
@@ -467,23 +1572,27 @@ class Graph():
         if self.logger.debugging:
             print(output)
 
-    def validate(self):
+    def validate(self, audit=False):
         '''
         a method that checks the coloring of the graph is valid
+        the clashes are counted as colors are set so this is O(1)
+        unless auditing or edges were added outside of the topology
         Parameters:
-            None
+            audit: True to check every node against its neighbors (boolean)
         Returns:
             True if valid
             False otherse
         '''
-        nodes = nx.get_node_attributes(self._graph, 'node')
+        if not audit and self._neighbors is None:
+            return self._conflicts == 0
+        colors = self._colors
         valid = True
         index = 0
-        while valid and index < len(nodes):
-            color = nodes[index].get_color()
-            if color is not None:
-                for neighbor in self._graph.neighbors(index):
-                    if nodes[neighbor].get_color() == color:
+        while valid and index < len(colors):
+            color = colors[index]
+            if color != NO_COLOR:
+                for neighbor in self.neighbors(index):
+                    if colors[neighbor] == color:
                         r1,c1 = self.get_row_column(index)
                         r2,c2 = self.get_row_column(neighbor)
                         self.logger.error('''
@@ -516,9 +1625,8 @@ class Graph():
         Returns:
             (row, column): a tuple of the row and column (int)
         '''
-        column = node_id % self.columns
-        row = int((node_id - column) / self.columns)
-        return (row, column)
+        return (self.topology.row_of[node_id],
+                self.topology.column_of[node_id])
 
     def list_to_string(self, l):
         '''
@@ -536,18 +1644,40 @@ class Graph():
 class Node():
     '''
     Node
-        the nodes that make up a Graph
+        the nodes that make up a Graph, the color and available colors
+        are kept at an index of a colors and a masks array, a node
+        made on its own has arrays of one item and a node of a graph
+        is a view on the arrays of the graph (see Graph.get_node)
+        whose changes are made through the graph
     '''
+    __slots__ = ("_row", "_column", "_colors", "_masks", "_id", "_graph")
+
     def __init__(self, row, column, size=9, color=None, logger=None):
         self._column = column
         self._row = row
-        self._color = color
-        self._available_colors = [x for x in range(size)]
-        if logger is None:
-            logging.basicConfig(level=logging.INFO,
-                            format='%(asctime)s %(message)s')
-            logger = logging.getLogger(__name__)
-        self.logger = logger
+        self._colors = array("b", [NO_COLOR if color is None else color])
+        # bit x is set when color x is available
+        self._masks = mask_array(size, [(1 << size) - 1])
+        self._id = 0
+        self._graph = None
+
+    @staticmethod
+    def view(graph, node_id):
+        '''
+        a function that makes a node on the state of a graph
+        Parameters:
+            graph: the graph of the node (Graph)
+            node_id: the id of the node (int)
+        Returns:
+            node: a node whose changes are made to the graph (Node)
+        '''
+        node = Node.__new__(Node)
+        node._row, node._column = divmod(node_id, graph.columns)
+        node._colors = graph._colors
+        node._masks = graph._masks
+        node._id = node_id
+        node._graph = graph
+        return node
 
     def get_index(self):
         '''
@@ -569,11 +1699,11 @@ class Node():
         Raises:
             Exception: if color is not an int
         '''
-        if type(color) is int:
-            self._color = color
-            self.logger.info("Setting Node(%d,%d) to Color %d" %
-                             (self._row, self._column, color))
-            self._available_colors = []
+        if self._graph is not None:
+            self._graph.set_node_color(self._row, self._column, color)
+        elif type(color) is int:
+            self._colors[self._id] = color
+            self._masks[self._id] = 0
         else:
             raise Exception("Node given non-int color")
 
@@ -585,7 +1715,8 @@ class Node():
         Returns:
             : color of the Node (int)
         '''
-        return self._color
+        color = self._colors[self._id]
+        return None if color == NO_COLOR else color
 
     def get_available_colors(self):
         '''
@@ -595,7 +1726,34 @@ class Node():
         Returns:
             : list of available colors
         '''
-        return self._available_colors
+        return mask_to_colors(self._masks[self._id])
+
+    def get_available_mask(self):
+        '''
+        a method that gets the bitmask of available colors for that node
+        Parameters:
+            none
+        Returns:
+            : bitmask of available colors, bit x set if color x is
+              available (int)
+        '''
+        return self._masks[self._id]
+
+    def set_state(self, color, mask):
+        '''
+        a method that sets the color and available colors of the Node
+        Parameters:
+            color: the color of the Node or None (int)
+            mask: the bitmask of available colors (int)
+        Returns:
+            none
+        Raises:
+            Exception: if the node is a view of a graph
+        '''
+        if self._graph is not None:
+            raise Exception("Set the state of a Node of a graph")
+        self._colors[self._id] = NO_COLOR if color is None else color
+        self._masks[self._id] = mask
 
     def remove_available_color(self, color):
         '''
@@ -603,21 +1761,26 @@ class Node():
         Parameters:
             color: the int value of the color to remove
         Returns:
-            none
+            : True if the color was available, False otherwise
         '''
-        index = len(self._available_colors)
-        done = False
-        self.logger.debug("Removing color %d from node (%d, %d)"
-                          % (color, self._row, self._column))
-        while index > 0 and not done:
-            index -= 1
-            if self._available_colors[index] == color:
-                self._available_colors.pop(index)
-                done = True
+        return self.remove_available_colors(1 << color)
 
-        return
+    def remove_available_colors(self, mask):
+        '''
+        a method that removes a set of colors from the available colors
+        Parameters:
+            mask: the bitmask of the colors to remove (int)
+        Returns:
+            : True if any of the colors were available, False otherwise
+        '''
+        if self._graph is not None:
+            return self._graph.remove_colors(self._id, mask)
+        removed = self._masks[self._id] & mask
+        self._masks[self._id] ^= removed
+        return removed != 0
 
 import unittest
+from solver.trace import ListSink
 
 class ThreeColorTest(unittest.TestCase):
     def setUp(self):
@@ -631,7 +1794,6 @@ class ThreeColorTest(unittest.TestCase):
         column = 0
         for r in range(3, self.g.rows):
             self.g.set_node_color(r, column, r)
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
         move = self.g.three_color_move(0)
         result = self.g.to_list()
         expect = [[' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' '],
@@ -646,7 +1808,7 @@ class ThreeColorTest(unittest.TestCase):
         expect_colors = [3, 4, 5, 6, 7, 8]
         checks = [1,2, 10, 11, 19, 20]
         for node in checks:
-            self.assertEqual(nodes[node].get_available_colors(), expect_colors)
+            self.assertEqual(self.g.get_node(node).get_available_colors(), expect_colors)
         self.assertEqual(move, True)
         self.assertEqual(expect, result)
 
@@ -671,10 +1833,9 @@ class ThreeColorTest(unittest.TestCase):
         self.assertEqual(result, expect)
         self.assertEqual(move, True)
         checks = [27, 36, 45, 54, 63, 72]
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
         expect_colors = [2, 3, 4, 5, 7, 8]
         for node in checks:
-            self.assertEqual(expect_colors, nodes[node].get_available_colors())
+            self.assertEqual(expect_colors, self.g.get_node(node).get_available_colors())
 
     def testNakedTrioMoveRow(self):
         self.g.set_node_color(1,0, 2)
@@ -698,10 +1859,9 @@ class ThreeColorTest(unittest.TestCase):
         self.assertEqual(result, expect)
         self.assertEqual(move, True)
         checks = [3, 4, 5, 6, 7, 8]
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
         expect_colors = [2, 4, 5, 6, 7, 8]
         for node in checks:
-            self.assertEqual(expect_colors, nodes[node].get_available_colors())
+            self.assertEqual(expect_colors, self.g.get_node(node).get_available_colors())
 
     def testColumnMove(self):
         column = 0
@@ -779,7 +1939,6 @@ class TwoColorTest(unittest.TestCase):
         column = 0
         for r in range(2, self.g.rows):
             self.g.set_node_color(r, column, r)
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
         move = self.g.two_color_move(0)
         result = self.g.to_list()
         expect = [[' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' '],
@@ -794,7 +1953,7 @@ class TwoColorTest(unittest.TestCase):
         expect_colors = [3, 4, 5, 6, 7, 8]
         checks = [1,2, 10, 11, 19, 20]
         for node in checks:
-            self.assertEqual(nodes[node].get_available_colors(), expect_colors)
+            self.assertEqual(self.g.get_node(node).get_available_colors(), expect_colors)
         self.assertEqual(move, True)
         self.assertEqual(expect, result)
 
@@ -820,10 +1979,9 @@ class TwoColorTest(unittest.TestCase):
         self.assertEqual(result, expect)
         self.assertEqual(move, True)
         checks = [27, 36, 45, 54, 63, 72]
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
         expect_colors = [2, 3, 4, 5, 7, 8]
         for node in checks:
-            self.assertEqual(expect_colors, nodes[node].get_available_colors())
+            self.assertEqual(expect_colors, self.g.get_node(node).get_available_colors())
 
     def testNakedPairMoveRow(self):
         self.g.set_node_color(1,0, 2)
@@ -847,10 +2005,9 @@ class TwoColorTest(unittest.TestCase):
         self.assertEqual(result, expect)
         self.assertEqual(move, True)
         checks = [3, 4, 5, 6, 7, 8]
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
         expect_colors = [2, 4, 5, 6, 7, 8]
         for node in checks:
-            self.assertEqual(expect_colors, nodes[node].get_available_colors())
+            self.assertEqual(expect_colors, self.g.get_node(node).get_available_colors())
 
     def testColumnMove(self):
         column = 0
@@ -927,14 +2084,18 @@ class GraphTest(unittest.TestCase):
         pass
 
     def testAssembleSquare(self):
-        node_list = self.g.assemble_square(0, 0)
-        expected = [0, 3, 6, 1, 4, 7, 2, 5, 8]
+        # a 3 by 3 board has no squares, a 9 by 9 one has 3 by 3 squares
+        with self.assertRaises(Exception):
+            self.g.assemble_square(0, 0)
+        node_list = Graph(9, logger=self.logger).assemble_square(0, 0)
+        expected = [0, 9, 18, 1, 10, 19, 2, 11, 20]
         self.assertEqual(expected, node_list)
 
+    @unittest.skipIf(nx is None, "networkx not installed")
     def testConnectNodeList(self):
         node_list = [0, 3, 6, 1, 4, 7, 2, 5, 8]
         self.g.connect_node_list(node_list)
-        for clique in nx.find_cliques(self.g._graph):
+        for clique in nx.find_cliques(self.g.to_networkx()):
             expect = len(clique)
             break
         self.assertEqual(expect, self.n**2)
@@ -950,16 +2111,18 @@ class GraphTest(unittest.TestCase):
         available = self.g.get_available_colors(0, 1)
         expect =  [1, 2, 3, 4,  5, 6, 7, 8]
         self.assertEqual(expect, available)
+        self.assertEqual(self.g.get_available_mask(0, 1), 0b111111110)
+        self.assertEqual(self.g.get_node_color(0, 0), 0)
+        self.assertEqual(self.g.get_node_color(0, 1), None)
 
     def testSetNodeColors(self):
         color = 0
         self.g.set_node_color(0, 0, color)
-        nodes = nx.get_node_attributes(self.g._graph, 'node')
-        result = nodes[0].get_color()
+        result = self.g.get_node(0).get_color()
         self.assertEqual(result, color)
         # check neighbors color were updated
-        for neighbor in self.g._graph.neighbors(0):
-            self.assertEqual(color in nodes[neighbor].get_available_colors(),
+        for neighbor in self.g.neighbors(0):
+            self.assertEqual(color in self.g.get_node(neighbor).get_available_colors(),
                              False)
             
         try:
@@ -973,7 +2136,22 @@ class GraphTest(unittest.TestCase):
         # no test need since called in constructor
         pass
 
+    def testNeighbors(self):
+        self.assertEqual(sorted(self.g.neighbors(0)), [1, 2, 3, 6])
+        self.assertEqual(sorted(self.g.neighbors(4)), [1, 3, 5, 7])
+        self.assertEqual(self.g.get_nodes(), list(range(9)))
+
+    @unittest.skipIf(nx is None, "networkx not installed")
+    def testToNetworkx(self):
+        graph = Graph(9).to_networkx()
+        self.assertEqual(graph.number_of_nodes(), 81)
+        self.assertEqual(graph.number_of_edges(), 810)
+        nodes = nx.get_node_attributes(graph, 'node')
+        self.assertEqual(nodes[10].get_index(), (1, 1))
+
     def testSameSquare(self):
+        self.assertEqual(self.g.same_square(0, 0, 0, 1), False)
+        self.g = Graph(9, logger=self.logger)
         self.assertEqual(self.g.same_square(0, 4, 3, 4), False)
         self.assertEqual(self.g.same_square(0, 0, 3, 4), True)
         self.assertEqual(self.g.same_square(0, 0, 3, 4), True)
@@ -992,6 +2170,57 @@ class GraphTest(unittest.TestCase):
         expect = []
         self.assertEqual(result, expect)
 
+    def testMaskHelpers(self):
+        self.assertEqual(mask_to_colors(0), [])
+        self.assertEqual(mask_to_colors(0b100101), [0, 2, 5])
+        self.assertEqual(count_colors(0b100101), 3)
+        self.assertEqual(count_colors(0), 0)
+        self.assertEqual(mask_to_color(0b1000), 3)
+
+    def testPopChanged(self):
+        self.g.set_node_color(0, 0, 1)
+        changed = self.g.pop_changed()
+        self.assertEqual(sorted(changed), [0, 1, 2, 3, 6])
+        self.assertEqual(self.g.pop_changed(), [])
+        self.assertEqual(self.g.remove_colors(4, 1 << 2), True)
+        self.assertEqual(self.g.remove_colors(4, 1 << 2), False)
+        self.assertEqual(self.g.pop_changed(), [4])
+        self.assertEqual(self.g.get_color_count(4), 2)
+        self.assertEqual(self.g.get_color_count(0), 0)
+
+    def testIsSolved(self):
+        self.assertEqual(self.g.is_solved(), False)
+        for row in range(self.n):
+            for column in range(self.n):
+                self.g.set_node_color(row, column, (row + column) % self.n)
+        self.assertEqual(self.g.is_solved(), True)
+
+    def testFewestColorsNode(self):
+        self.assertEqual(self.g.get_fewest_colors_node(), 0)
+        self.g.set_node_color(0, 0, 0)
+        self.g.set_node_color(1, 1, 1)
+        self.assertEqual(self.g.get_fewest_colors_node(), 1)
+        self.assertEqual(self.g.has_contradiction(), False)
+        self.g.remove_colors(1, 1 << 2)
+        self.assertEqual(self.g.has_contradiction(), True)
+
+    def testReset(self):
+        self.g.set_node_color(0, 0, 0)
+        self.g.reset()
+        self.assertEqual(self.g.to_list(), [[' '] * 3] * 3)
+        self.assertEqual(self.g.get_available_colors(0, 1), [0, 1, 2])
+        self.assertEqual(self.g.pop_changed(), [])
+
+    def testSnapshotRestore(self):
+        state = self.g.snapshot()
+        self.g.set_node_color(0, 0, 0)
+        self.g.remove_colors(4, 1 << 2)
+        self.g.restore(state)
+        self.assertEqual(self.g.to_list(), [[' '] * 3] * 3)
+        self.assertEqual(self.g.get_available_colors(0, 1), [0, 1, 2])
+        self.assertEqual(self.g.get_available_colors(1, 1), [0, 1, 2])
+        self.assertEqual(self.g.pop_changed(), [])
+
     def testValidate(self):
         self.g.set_node_color(0, 1, 0)
         valid = self.g.validate()
@@ -1000,6 +2229,58 @@ class GraphTest(unittest.TestCase):
         valid = self.g.validate()
         self.assertEqual(valid, False, ' InValid Graph was said to be valid')
 
+    def testValidateIncremental(self):
+        self.g = Graph(9, logger=self.logger)
+        self.g.set_node_color(0, 0, 0)
+        self.g.set_node_color(4, 4, 0)
+        self.assertEqual(self.g.validate(), True)
+        self.assertEqual(self.g.validate(audit=True), True)
+        state = self.g.snapshot()
+        # same square
+        self.g.set_node_color(1, 1, 0)
+        self.assertEqual(self.g.validate(), False)
+        self.assertEqual(self.g.validate(audit=True), False)
+        self.g.restore(state)
+        self.assertEqual(self.g.validate(), True)
+        # same column
+        self.g.set_node_color(8, 4, 0)
+        self.assertEqual(self.g.validate(), False)
+        self.g.reset()
+        self.assertEqual(self.g.validate(), True)
+
+    def testAddNode(self):
+        self.g = Graph(9, logger=self.logger)
+        mark = self.g.mark()
+        self.g.add_node(Node(0, 0, color=4))
+        self.assertEqual(self.g.get_node_color(0, 0), 4)
+        self.assertEqual(4 in self.g.get_available_colors(0, 1), False)
+        # color 4 is used in row 0 so it has no places left there
+        self.assertEqual(self.g._places[4], 0)
+        self.g.set_node_color(0, 1, 4)
+        self.assertEqual(self.g.validate(), False)
+        self.assertEqual(self.g.validate(audit=True), False)
+        self.g.undo(mark)
+        self.assertEqual(self.g.get_node_color(0, 0), None)
+        self.assertEqual(self.g.get_available_colors(0, 1), list(range(9)))
+        self.assertEqual(self.g.validate(), True)
+        node = Node(2, 2)
+        node.remove_available_colors(0b11)
+        self.g.add_node(node)
+        self.assertEqual(self.g.get_available_colors(2, 2), list(range(2, 9)))
+        # row 2 lost its place at column 2 for color 0
+        self.assertEqual(self.g._places[2 * 9 + 0] & (1 << 2), 0)
+        with self.assertRaises(Exception):
+            self.g.add_node(Node(9, 0))
+        self.g.add_node(Node(1, 1, color=0))
+        with self.assertRaises(Exception):
+            self.g.add_node(Node(1, 1, color=0))
+
+    def testValidateAddedEdge(self):
+        self.g.add_edge(0, 4)
+        self.g.set_node_color(0, 0, 0)
+        self.g.set_node_color(1, 1, 0)
+        self.assertEqual(self.g.validate(), False)
+
     def testGetNodeId(self):
         result = self.g.get_node_id(0, 0)
         self.assertEqual(result, 0)
@@ -1016,6 +2297,544 @@ class GraphTest(unittest.TestCase):
         result = self.g.get_row_column(4)
         self.assertEqual(result, (1, 1))
 
+class BoxShapeTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        # boxes of two rows by three columns
+        self.g = Graph(6, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def testBoxShape(self):
+        self.assertEqual(self.g.box_shape(), (2, 3))
+        self.assertEqual(Graph(6, logger=self.logger, box=(3, 2)).box_shape(),
+                         (3, 2))
+        self.assertEqual(Graph(16, logger=self.logger).box_shape(), (4, 4))
+        self.assertEqual(Graph(25, logger=self.logger).box_shape(), (5, 5))
+
+    def testSameSquare(self):
+        self.assertEqual(self.g.same_square(0, 2, 0, 1), True)
+        self.assertEqual(self.g.same_square(0, 3, 0, 1), False)
+        self.assertEqual(self.g.same_square(0, 2, 1, 2), False)
+
+    def testAssembleSquare(self):
+        self.assertEqual(self.g.assemble_square(2, 3),
+                         [15, 21, 16, 22, 17, 23])
+
+    def testNoBoxes(self):
+        # 7 is prime so the board has rows and columns only
+        g = Graph(7, logger=self.logger)
+        self.assertEqual(g.box_shape(), False)
+        self.assertEqual(g.same_square(0, 1, 0, 1), False)
+        with self.assertRaises(Exception):
+            g.assemble_square(0, 0)
+        g.set_node_color(0, 0, 0)
+        self.assertEqual(g.get_available_colors(1, 1), list(range(7)))
+        self.assertEqual(g.get_available_colors(0, 1), list(range(1, 7)))
+
+    def testBoxUnits(self):
+        # color 0 is placed in the top right box so its other nodes lose it
+        self.g.set_node_color(0, 3, 0)
+        self.assertEqual(self.g.get_available_colors(1, 5), [1, 2, 3, 4, 5])
+        self.assertEqual(self.g.get_available_colors(2, 5),
+                         [0, 1, 2, 3, 4, 5])
+
+    def testLargeBoard(self):
+        g = Graph(25, logger=self.logger)
+        self.assertEqual(g.board_bytes(), 625 * 5)
+        g.set_node_color(24, 24, 24)
+        self.assertEqual(g.get_available_mask(20, 20), (1 << 24) - 1)
+        self.assertEqual(g.get_available_mask(19, 19), (1 << 25) - 1)
+
+class HiddenSingleTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def testPlaces(self):
+        self.g.set_node_color(0, 0, 0)
+        # color 0 is used so row 0 has no place left for it
+        self.assertEqual(self.g._places[0], 0)
+        # the top three nodes of column 1 share the box so lost color 0
+        self.assertEqual(self.g._places[10 * 9], 0b111111000)
+        self.assertEqual(self.g._places[10 * 9 + 1], 0b111111111)
+        self.g.remove_colors(12, 1 << 1)
+        self.assertEqual(self.g._places[1 * 9 + 1], 0b111110111)
+
+    def testManyColors(self):
+        # color 0 is kept out of every node of row 0 but the last,
+        # which still has all nine colors
+        for column in range(8):
+            self.g.remove_colors(column, 1)
+        self.assertEqual(self.g.get_color_count(8), 9)
+        self.assertEqual(self.g.play_hidden_singles(), True)
+        self.assertEqual(self.g.get_node_color(0, 8), 0)
+        self.assertEqual(self.g.play_hidden_singles(), False)
+
+    def testPlayTechnique(self):
+        # color 0 is left only at (0, 8) and color 1 only at (8, 0),
+        # each step of the technique places one of them
+        for column in range(8):
+            self.g.remove_colors(column, 1)
+            self.g.remove_colors(73 + column, 2)
+        self.assertEqual(self.g.play_technique(HIDDEN_SINGLE), True)
+        colored = [self.g.get_node_color(0, 8), self.g.get_node_color(8, 0)]
+        self.assertEqual(colored.count(None), 1)
+        self.assertEqual(self.g.play_technique(HIDDEN_SINGLE), True)
+        self.assertEqual(self.g.get_node_color(0, 8), 0)
+        self.assertEqual(self.g.get_node_color(8, 0), 1)
+        self.assertEqual(self.g.play_technique(HIDDEN_SINGLE), False)
+
+    def testStale(self):
+        for column in range(8):
+            self.g.remove_colors(column, 1)
+        self.g.set_node_color(0, 8, 0)
+        self.assertEqual(self.g.play_hidden_singles(), False)
+        self.assertEqual(self.g.validate(), True)
+
+    def testSnapshotRestore(self):
+        state = self.g.snapshot()
+        for column in range(8):
+            self.g.remove_colors(column, 1)
+        self.g.restore(state)
+        self.assertEqual(self.g.play_hidden_singles(), False)
+        self.assertEqual(self.g._places[0], 0b111111111)
+        self.g.reset()
+        self.assertEqual(self.g._singles, [])
+
+    def testStats(self):
+        self.g.stats = Stats()
+        for column in range(8):
+            self.g.remove_colors(column, 1)
+        self.g.play_hidden_singles()
+        counters = self.g.stats.techniques[HIDDEN_SINGLE]
+        self.assertEqual(counters["placements"], 1)
+        self.assertEqual(counters["successes"], 1)
+
+class SubsetTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def keep(self, node_id, colors):
+        mask = 0
+        for color in colors:
+            mask |= 1 << color
+        self.g.remove_colors(node_id, ~mask & 0b111111111)
+
+    def testFindSubsets(self):
+        masks = [0b011, 0b110, 0b101, 0b1111, 0b11000]
+        self.assertEqual(find_subsets(masks, 3), [((0, 1, 2), 0b111)])
+        self.assertEqual(find_subsets(masks, 2), [])
+        self.assertEqual(find_subsets([0b11, 0b11, 0b1100], 2),
+                         [((0, 1), 0b11)])
+
+    def testNakedTriple(self):
+        # {1, 2}, {2, 3} and {1, 3} in row 0
+        self.keep(0, [1, 2])
+        self.keep(4, [2, 3])
+        self.keep(8, [1, 3])
+        self.assertEqual(self.g.naked_subset_move(0), True)
+        for column in (1, 2, 3, 5, 6, 7):
+            self.assertEqual(self.g.get_available_colors(0, column),
+                             [0, 4, 5, 6, 7, 8])
+        self.assertEqual(self.g.get_available_colors(0, 4), [2, 3])
+        self.assertEqual(self.g.naked_subset_move(0), False)
+
+    def testHiddenPair(self):
+        # colors 0 and 1 only fit the first two nodes of row 0
+        for column in range(2, 9):
+            self.g.remove_colors(column, 0b11)
+        self.assertEqual(self.g.hidden_subset_move(0), True)
+        self.assertEqual(self.g.get_available_colors(0, 0), [0, 1])
+        self.assertEqual(self.g.get_available_colors(0, 1), [0, 1])
+        self.assertEqual(self.g.hidden_subset_move(0), False)
+
+    def testNodeSubset(self):
+        self.keep(0, [1, 2, 3])
+        self.keep(1, [1, 2])
+        self.keep(2, [2, 3])
+        self.assertEqual(self.g.three_color_move(0), True)
+        self.assertEqual(self.g.get_available_colors(0, 3),
+                         [0, 4, 5, 6, 7, 8])
+        self.assertEqual(self.g.get_available_colors(1, 1),
+                         [0, 4, 5, 6, 7, 8])
+
+    def testPlaySubsets(self):
+        self.g.stats = Stats()
+        self.assertEqual(self.g.play_subsets(), False)
+        self.assertEqual(self.g._dirty_units, bytearray(27))
+        self.keep(0, [1, 2])
+        self.keep(4, [2, 3])
+        self.keep(8, [1, 3])
+        self.assertEqual(self.g._dirty_units[0], True)
+        self.assertEqual(self.g.play_subsets(), True)
+        self.assertEqual(self.g.get_available_colors(0, 1),
+                         [0, 4, 5, 6, 7, 8])
+        counters = self.g.stats.techniques[NAKED_SUBSET]
+        self.assertEqual(counters["eliminations"], 18)
+
+class LockedCandidatesTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def testPointing(self):
+        # color 0 only fits row 0 of the top left box
+        for node_id in (9, 10, 11, 18, 19, 20):
+            self.g.remove_colors(node_id, 1)
+        self.assertEqual(self.g.locked_candidates_move(0), True)
+        for column in range(3, 9):
+            self.assertEqual(0 in self.g.get_available_colors(0, column),
+                             False)
+        self.assertEqual(0 in self.g.get_available_colors(1, 3), True)
+        self.assertEqual(self.g.locked_candidates_move(0), False)
+
+    def testClaiming(self):
+        # color 0 only fits the top left box in row 0
+        for column in range(3, 9):
+            self.g.remove_colors(column, 1)
+        self.assertEqual(self.g.locked_candidates_move(1), True)
+        for node_id in (9, 10, 11, 18, 19, 20):
+            self.assertEqual(self.g.get_color_count(node_id), 8)
+        self.assertEqual(0 in self.g.get_available_colors(3, 0), True)
+
+    def testMakeMove(self):
+        self.g.stats = Stats()
+        for node_id in (9, 10, 11, 18, 19, 20):
+            self.g.remove_colors(node_id, 1)
+        self.assertEqual(self.g.make_move(0, 0), True)
+        counters = self.g.stats.techniques[LOCKED_CANDIDATES]
+        self.assertEqual(counters["eliminations"], 6)
+        self.assertEqual(self.g.make_move(0, 0), False)
+
+class FishTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def only(self, row, columns, color=0):
+        # keep color only in the given columns of the row
+        for column in range(9):
+            if column not in columns:
+                self.g.remove_colors(row * 9 + column, 1 << color)
+
+    def testXWing(self):
+        self.only(1, (2, 6))
+        self.only(4, (2, 6))
+        self.assertEqual(self.g.fish_move(0, 2), True)
+        for row in (0, 2, 3, 5, 6, 7, 8):
+            self.assertEqual(0 in self.g.get_available_colors(row, 2), False)
+            self.assertEqual(0 in self.g.get_available_colors(row, 6), False)
+            self.assertEqual(0 in self.g.get_available_colors(row, 3), True)
+        self.assertEqual(0 in self.g.get_available_colors(1, 2), True)
+        self.assertEqual(self.g.fish_move(0, 2), False)
+
+    def testSwordfishColumns(self):
+        # the same fish turned on its side
+        for column, rows in ((0, (1, 4)), (4, (4, 7)), (8, (1, 7))):
+            for row in range(9):
+                if row not in rows:
+                    self.g.remove_colors(row * 9 + column, 1 << 3)
+        self.assertEqual(self.g.fish_move(3, 2), False)
+        self.assertEqual(self.g.fish_move(3, 3), True)
+        for row in (1, 4, 7):
+            self.assertEqual(self.g.get_available_colors(row, 2),
+                             [0, 1, 2, 4, 5, 6, 7, 8])
+
+    def testPlayTiers(self):
+        self.g.stats = Stats()
+        self.g.play_tiers()
+        self.only(1, (2, 6))
+        self.only(4, (2, 6))
+        self.g.tiers = [SUBSETS]
+        self.assertEqual(self.g.play_tiers(), False)
+        self.g.tiers = [SUBSETS, FISH]
+        self.assertEqual(self.g.play_tiers(), True)
+        self.assertEqual(self.g.stats.techniques["x-wing"]["eliminations"],
+                         14)
+        self.assertEqual(self.g._dirty_colors, 1)
+        self.g.tiers = ["unknown"]
+        with self.assertRaises(Exception):
+            self.g.play_tiers()
+
+class ChainTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+        self.g.stats = Stats()
+
+    def tearDown(self):
+        pass
+
+    def only(self, unit_id, positions, color=0):
+        # keep color only at the given positions of the unit
+        for position, node_id in enumerate(self.g.topology.units[unit_id]):
+            if position not in positions:
+                self.g.remove_colors(node_id, 1 << color)
+
+    def keep(self, node_id, colors):
+        mask = 0
+        for color in colors:
+            mask |= 1 << color
+        self.g.remove_colors(node_id, ~mask & 0b111111111)
+
+    def testStrongLinks(self):
+        self.assertEqual(self.g.strong_links(0), {})
+        self.only(0, (1, 7))
+        self.assertEqual(self.g._strong_units[0], 1)
+        self.assertEqual(self.g.strong_links(0), {1: [7], 7: [1]})
+        self.g.remove_colors(7, 1)
+        self.assertEqual(self.g._strong_units[0], 0)
+        self.assertEqual(self.g.strong_links(0), {})
+
+    def testSkyscraper(self):
+        # rows 0 and 4 each have two places for color 0 and share
+        # column 1, so (0, 7) or (4, 6) takes it
+        self.only(0, (1, 7))
+        self.only(4, (1, 6))
+        self.assertEqual(self.g.x_chain_move(0), True)
+        # the nodes seeing both (0, 7) and (4, 6)
+        for row, column in ((1, 6), (2, 6), (3, 7), (5, 7)):
+            self.assertEqual(0 in self.g.get_available_colors(row, column),
+                             False)
+        self.assertEqual(0 in self.g.get_available_colors(1, 7), True)
+        self.assertEqual(self.g.stats.chain_lengths, {4: 1})
+
+    def testColoringTrap(self):
+        # (0, 7), (0, 1), (4, 1) and (4, 6) are strongly linked
+        self.only(0, (1, 7))
+        self.only(4, (1, 6))
+        self.only(10, (0, 4))
+        self.assertEqual(self.g.coloring_move(0), True)
+        self.assertEqual(0 in self.g.get_available_colors(1, 6), False)
+        self.assertEqual(0 in self.g.get_available_colors(3, 7), False)
+        self.assertEqual(0 in self.g.get_available_colors(1, 7), True)
+
+    def testColoringWrap(self):
+        # (0, 1), (4, 4) and (1, 2) take color 0 in the same turn
+        # but (0, 1) and (1, 2) share a box so none of them can
+        self.only(0, (1, 4))
+        self.only(13, (0, 4))
+        self.only(4, (2, 4))
+        self.only(11, (1, 4))
+        links = self.g.strong_links(0)
+        self.assertEqual(sorted(links), [1, 4, 11, 38, 40])
+        self.assertEqual(self.g.coloring_move(0), True)
+        for row, column in ((0, 1), (4, 4), (1, 2)):
+            self.assertEqual(0 in self.g.get_available_colors(row, column),
+                             False)
+        self.assertEqual(0 in self.g.get_available_colors(0, 4), True)
+        self.assertEqual(self.g.stats.chain_lengths, {5: 1})
+
+    def testXYWing(self):
+        self.keep(0, [0, 1])
+        self.keep(4, [0, 2])
+        self.keep(27, [1, 2])
+        self.assertEqual(self.g.xy_wing_move(), True)
+        # the nodes seeing (0, 4) and (3, 0) lose color 2
+        self.assertEqual(2 in self.g.get_available_colors(3, 4), False)
+        self.assertEqual(2 in self.g.get_available_colors(0, 1), True)
+        self.assertEqual(self.g.stats.chain_lengths, {3: 1})
+
+    def testPlayChains(self):
+        self.g.tiers = [CHAINS]
+        self.assertEqual(self.g.play_tiers(), False)
+        self.only(0, (1, 7))
+        self.only(4, (1, 6))
+        self.assertEqual(self.g.play_tiers(), True)
+        techniques = self.g.stats.techniques
+        self.assertEqual(techniques[SIMPLE_COLORING]["successes"], 0)
+        self.assertEqual(techniques[X_CHAIN]["successes"], 1)
+
+class TrailTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+        self.g.set_node_color(0, 0, 0)
+
+    def tearDown(self):
+        pass
+
+    def testUndo(self):
+        before = self.g.snapshot()
+        mark = self.g.mark()
+        self.g.set_node_color(4, 4, 4)
+        self.g.remove_colors(80, 0b111)
+        inner = self.g.mark()
+        self.g.set_node_color(1, 1, 0)
+        self.assertEqual(self.g.validate(), False)
+        self.g.undo(inner)
+        self.assertEqual(self.g.validate(), True)
+        self.assertEqual(self.g.get_node_color(4, 4), 4)
+        self.g.undo(mark)
+        self.assertEqual(self.g.snapshot(), before)
+        places = self.g._places[:]
+        strong = list(self.g._strong_units)
+        self.assertEqual(self.g.pop_changed(), [])
+        self.assertEqual(len(self.g._trail), 0)
+        self.g.stop_trail()
+        self.g.set_node_color(4, 4, 4)
+        self.assertEqual(self.g._trail, None)
+        # the restored indexes match the ones undo put back
+        self.g.restore(before)
+        self.assertEqual(self.g._places, places)
+        self.assertEqual(self.g._strong_units, strong)
+
+    def testUndoSingles(self):
+        mark = self.g.mark()
+        for column in range(8):
+            self.g.remove_colors(9 + column, 1 << 3)
+        self.assertEqual(self.g.play_hidden_singles(), True)
+        self.g.undo(mark)
+        self.assertEqual(self.g.get_node_color(1, 8), None)
+        self.assertEqual(self.g.play_hidden_singles(), False)
+
+    def testCopy(self):
+        self.g.add_edge(0, 80)
+        copy = self.g.copy()
+        self.assertEqual(copy.snapshot(), self.g.snapshot())
+        copy.set_node_color(8, 8, 1)
+        copy.add_edge(1, 79)
+        self.assertEqual(self.g.get_node_color(8, 8), None)
+        self.assertEqual(self.g.get_available_colors(8, 7), list(range(9)))
+        self.assertEqual(79 in self.g.neighbors(1), False)
+        self.assertIs(copy.topology, self.g.topology)
+
+    def testLoadGrid(self):
+        grid = [[" "] * 9 for __ in range(9)]
+        grid[0][0] = 0
+        grid[4][4] = 4
+        grid[8][0] = 1
+        self.g.load_grid(grid)
+        fast = (self.g.snapshot(), self.g._places[:],
+                list(self.g._strong_units), sorted(self.g._singles))
+        self.g.reset()
+        for row, colors in enumerate(grid):
+            for column, color in enumerate(colors):
+                if color != " ":
+                    self.g.set_node_color(row, column, color)
+        self.assertEqual(fast, (self.g.snapshot(), self.g._places[:],
+                                list(self.g._strong_units),
+                                sorted(self.g._singles)))
+        grid[0][8] = 0
+        self.g.load_grid(grid)
+        self.assertEqual(self.g.validate(), False)
+
+    def testMemory(self):
+        self.assertEqual(self.g.board_bytes(), 81 * 5)
+        colors, masks, __ = self.g.snapshot()
+        self.assertEqual(len(colors) + len(masks), 81 * 5)
+        self.assertEqual(Graph(16, logger=self.logger).board_bytes(),
+                         256 * 5)
+
+class TraceTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+
+    def tearDown(self):
+        pass
+
+    def testTracePlace(self):
+        sink = ListSink()
+        self.g.trace = sink
+        self.g.set_node_color(0, 0, 0)
+        self.assertEqual(sink.events[0], Event(PLACE, (0, 0), None, [0]))
+        self.assertEqual(len(sink.events), 21)
+        self.assertEqual(sink.events[1].kind, ELIMINATE)
+        self.assertEqual(sink.events[1].colors, [0])
+        sink.events = []
+        self.g.trace = None
+        self.g.set_node_color(1, 1, 1)
+        self.assertEqual(sink.events, [])
+
+    def testTraceTechnique(self):
+        for c in range(2, 9):
+            self.g.set_node_color(0, c, c)
+        self.g.set_node_color(8, 1, 0)
+        sink = ListSink()
+        self.g.trace = sink
+        self.g.stats = Stats()
+        # the hidden single is found by the move of a two color node
+        # so the trace and the stats both label it a two color move
+        self.assertEqual(self.g.make_move(0, 0), True)
+        self.assertEqual(sink.events[0], Event(PLACE, (0, 0),
+                                               TWO_COLOR, [0]))
+        self.assertEqual(sink.events[1].technique, TWO_COLOR)
+        self.assertEqual(self.g.stats.techniques[TWO_COLOR]["placements"], 1)
+        self.assertEqual(HIDDEN_SINGLE in self.g.stats.techniques, False)
+        sink.events = []
+        self.assertEqual(self.g.make_move(0, 1), True)
+        self.assertEqual(sink.events[0], Event(PLACE, (0, 1),
+                                               OBVIOUS, [1]))
+
+class StatsTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.g = Graph(9, logger=self.logger)
+        self.g.stats = Stats()
+
+    def tearDown(self):
+        pass
+
+    def testMakeMoveStats(self):
+        for c in range(2, 9):
+            self.g.set_node_color(0, c, c)
+        self.g.set_node_color(8, 1, 0)
+        self.assertEqual(self.g.make_move(0, 0), True)
+        self.assertEqual(self.g.make_move(0, 1), True)
+        self.assertEqual(self.g.make_move(4, 4), False)
+        techniques = self.g.stats.techniques
+        self.assertEqual(techniques[TWO_COLOR]["invocations"], 1)
+        self.assertEqual(techniques[TWO_COLOR]["successes"], 1)
+        self.assertEqual(techniques[TWO_COLOR]["placements"], 1)
+        # color 0 leaves (1, 2), (2, 2) and column 0 down to row 5
+        self.assertEqual(techniques[TWO_COLOR]["eliminations"], 7)
+        self.assertEqual(techniques[OBVIOUS]["placements"], 1)
+        self.assertEqual(techniques[TWO_COLOR]["time"] >= 0, True)
+        self.assertEqual(THREE_COLOR in techniques, False)
+
 class NodeTest(unittest.TestCase):
 
     def setUp(self):
@@ -1051,12 +2870,43 @@ class NodeTest(unittest.TestCase):
         self.assertEqual(available, expect)
         self.node.remove_available_color(1)
         available = self.node.get_available_colors()
-        expect = [0]
+        expect = [0, 2, 3, 4, 5, 6, 7, 8]
+        self.assertEqual(available, expect)
+        self.assertEqual(self.node.get_available_mask(), 0b111111101)
+        self.assertEqual(self.node.remove_available_colors(0b110), True)
+        self.assertEqual(self.node.remove_available_colors(0b110), False)
+        self.assertEqual(self.node.get_available_colors(),
+                         [0, 3, 4, 5, 6, 7, 8])
         self.node.set_color(0)
         available = self.node.get_available_colors()
         expect = []
         self.assertEqual(available, expect)
 
+    def testSlots(self):
+        self.assertEqual(hasattr(self.node, "__dict__"), False)
+
+    def testView(self):
+        g = Graph(9, logger=logging.getLogger(__name__))
+        node = g.get_node(10)
+        self.assertEqual(node.get_index(), (1, 1))
+        g.set_node_color(1, 1, 4)
+        self.assertEqual(node.get_color(), 4)
+        self.assertEqual(node.get_available_mask(), 0)
+        mark = g.mark()
+        g.get_node(11).remove_available_color(0)
+        self.assertEqual(g.get_available_colors(1, 2), [1, 2, 3, 5, 6, 7, 8])
+        g.get_node(12).set_color(0)
+        self.assertEqual(g.get_node_color(1, 3), 0)
+        self.assertEqual(g.get_available_colors(1, 5), [1, 2, 3, 5, 6, 7, 8])
+        with self.assertRaises(Exception):
+            g.get_node(13).set_state(None, 0)
+        g.undo(mark)
+        self.assertEqual(g.get_available_colors(1, 2),
+                         [0, 1, 2, 3, 5, 6, 7, 8])
+        self.assertEqual(g.get_node_color(1, 3), None)
+        g.add_node(Node(8, 8, color=2))
+        self.assertEqual(g.get_node_color(8, 8), 2)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+-------------------------------------------------------
+reader
+reads sudoku puzzles lazily from files, stdin or lines
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+import sys
+
+# the symbols of the one line format, the symbol at index x is color x
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+# the symbols of a node with no color in the one line format
+BLANKS = ".0"
+
+def read_puzzles(source, n=9):
+    '''
+    a generator that reads puzzles one at a time
+    two formats are understood and can be mixed:
+        n lines of comma separated colors (the tests/test*.txt format)
+        one line of n * n symbols (see SYMBOLS and BLANKS), anything
+        after a comma on that line (like a solution) is ignored
+    blank lines end a comma grid and lines starting with # are skipped
+    Parameters:
+        source: a file path, "-" for stdin, an open file or
+                an iterable of lines
+        n: the size of the puzzles (int)
+    Returns:
+        : a generator of puzzles, each a list of rows in the
+          Graph.to_list format
+    Raises:
+        Exception: if a line is not in either format
+    '''
+    if source == "-":
+        for puzzle in _read_lines(sys.stdin, n):
+            yield puzzle
+    elif isinstance(source, str):
+        with open(source) as f:
+            for puzzle in _read_lines(f, n):
+                yield puzzle
+    else:
+        for puzzle in _read_lines(source, n):
+            yield puzzle
+
+def _read_lines(lines, n):
+    '''
+    a generator that parses the puzzles from lines
+    Parameters:
+        lines: an iterable of lines
+        n: the size of the puzzles (int)
+    Returns:
+        : a generator of puzzles (see read_puzzles)
+    Raises:
+        Exception: if a row is malformed or not n colors long or a
+                   comma grid ends before its n rows
+    '''
+    rows = []
+    length = n * n
+    for line in lines:
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            if len(rows) > 0:
+                raise Exception("Puzzle is not %d rows long" % n)
+            continue
+        first = line.split(",", 1)[0].strip()
+        if len(first) == length:
+            if len(rows) > 0:
+                raise Exception("Puzzle is not %d rows long" % n)
+            yield parse_line(first, n)
+        elif "," in line:
+            row = parse_row(line, n)
+            if row is None:
+                # only a header may come before the rows of a puzzle
+                if len(rows) > 0:
+                    raise Exception("Malformed row: %s" % line)
+                continue
+            if len(row) != n:
+                raise Exception("Row is not %d colors long: %s" % (n, line))
+            rows.append(row)
+            if len(rows) == n:
+                yield rows
+                rows = []
+        else:
+            raise Exception("Unknown puzzle line: %s" % line)
+    if len(rows) > 0:
+        raise Exception("Puzzle is not %d rows long" % n)
+
+def parse_row(line, n=9):
+    '''
+    a function that parses one row of comma separated colors
+    Parameters:
+        line: the line to parse (str)
+        n: the size of the puzzle (int)
+    Returns:
+        row: the colors of the row, ' ' for no color, or None if
+             the line is not a row (like a header) (list)
+    Raises:
+        Exception: if a color is not below n
+    '''
+    row = []
+    for field in line.split(","):
+        field = field.strip()
+        if field.isdigit():
+            color = int(field)
+            if color >= n:
+                raise Exception("Unknown color: %s" % field)
+            row.append(color)
+        elif field == "":
+            row.append(" ")
+        else:
+            return None
+    return row
+
+def parse_line(line, n=9):
+    '''
+    a function that parses a puzzle written on one line
+    Parameters:
+        line: the n * n symbols of the puzzle (str)
+        n: the size of the puzzle (int)
+    Returns:
+        puzzle: the rows of the puzzle in the Graph.to_list format (list)
+    Raises:
+        Exception: if the line is not n * n symbols long or
+                   a symbol is not a color or a blank
+    '''
+    if len(line) != n * n:
+        raise Exception("Puzzle line is not %d symbols long: %s"
+                        % (n * n, line))
+    lookup = _lookup(n)
+    puzzle = []
+    index = 0
+    for __ in range(n):
+        row = []
+        for symbol in line[index:index + n]:
+            color = lookup.get(symbol)
+            if color is None:
+                raise Exception("Unknown symbol: %s" % symbol)
+            row.append(color)
+        puzzle.append(row)
+        index += n
+    return puzzle
+
+def to_line(puzzle):
+    '''
+    a function that writes a puzzle on one line
+    Parameters:
+        puzzle: the rows of the puzzle in the Graph.to_list format (list)
+    Returns:
+        : the puzzle in the one line format with . for blanks (str)
+    '''
+    symbols = []
+    for row in puzzle:
+        for color in row:
+            if color is None or color == " ":
+                symbols.append(".")
+            else:
+                symbols.append(SYMBOLS[color])
+    return "".join(symbols)
+
+_LOOKUPS = {}
+
+def _lookup(n):
+    '''
+    a function that gets the symbol to color table for a puzzle size
+    Parameters:
+        n: the size of the puzzle (int)
+    Returns:
+        lookup: the color of each symbol, ' ' for blanks (dict)
+    '''
+    lookup = _LOOKUPS.get(n)
+    if lookup is None:
+        if n > len(SYMBOLS):
+            raise Exception("No symbols for puzzles of size %d" % n)
+        lookup = {}
+        for color, symbol in enumerate(SYMBOLS[:n]):
+            lookup[symbol] = color
+            lookup[symbol.lower()] = color
+        for symbol in BLANKS:
+            lookup[symbol] = " "
+        _LOOKUPS[n] = lookup
+    return lookup
+
+import unittest
+import io
+import os
+
+class ReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_directory = os.path.dirname(os.getcwd())
+        self.line = ("8........" "..36....." ".7..9.2.." ".5...7..."
+                     "....457.." "...1...3." "..1....68" "..85...1."
+                     ".9....4..")
+
+    def tearDown(self):
+        pass
+
+    def testParseLine(self):
+        puzzle = parse_line(self.line)
+        self.assertEqual(len(puzzle), 9)
+        self.assertEqual(puzzle[0], [7] + [" "] * 8)
+        self.assertEqual(puzzle[1], [" ", " ", 2, 5] + [" "] * 5)
+        self.assertEqual(to_line(puzzle), self.line)
+        zeros = self.line.replace(".", "0")
+        self.assertEqual(parse_line(zeros), puzzle)
+        with self.assertRaises(Exception):
+            parse_line("x" * 81)
+
+    def testParseRow(self):
+        self.assertEqual(parse_row("3, ,6,1,7,4,5, ,"),
+                         [3, " ", 6, 1, 7, 4, 5, " ", " "])
+        self.assertEqual(parse_row("quizzes,solutions"), None)
+
+    def testReadFile(self):
+        path = os.path.join(self.test_directory, "tests", "test.txt")
+        puzzles = list(read_puzzles(path))
+        self.assertEqual(len(puzzles), 1)
+        self.assertEqual(puzzles[0][0], [3, " ", 6, 1, 7, 4, 5, " ", " "])
+        self.assertEqual(puzzles[0][8], [8, 3, " ", " ", 1, " ", 2, " ", 4])
+
+    def testReadMixed(self):
+        path = os.path.join(self.test_directory, "tests", "test2.txt")
+        with open(path) as f:
+            grid = f.read()
+        lines = io.StringIO("# a comment\n" + self.line + "\n\n" + grid +
+                            "\nquizzes,solutions\n" + self.line + "," +
+                            self.line.replace(".", "1") + "\n")
+        puzzles = read_puzzles(lines)
+        self.assertEqual(next(puzzles), parse_line(self.line))
+        self.assertEqual(next(puzzles), list(read_puzzles(path))[0])
+        self.assertEqual(next(puzzles), parse_line(self.line))
+        self.assertEqual(list(puzzles), [])
+
+    def testReadLarge(self):
+        line = "G" + "." * 255
+        puzzle = next(read_puzzles([line], n=16))
+        self.assertEqual(puzzle[0][0], 15)
+        self.assertEqual(to_line(puzzle), line)
+
+    def testParseLineLength(self):
+        with self.assertRaises(Exception):
+            parse_line("123", 9)
+        with self.assertRaises(Exception):
+            parse_line(self.line + "1", 9)
+
+    def testMalformedRow(self):
+        grid = ["3, ,6,1,7,4,5, ,"] * 9
+        with self.assertRaises(Exception):
+            list(read_puzzles(grid[:4] + ["3, ,x,1,7,4,5, ,"] + grid[5:]))
+        with self.assertRaises(Exception):
+            list(read_puzzles(grid[:4] + ["3, ,6,1"] + grid[5:]))
+        with self.assertRaises(Exception):
+            list(read_puzzles(grid[:4] + ["3, ,9,1,7,4,5, ,"] + grid[5:]))
+        with self.assertRaises(Exception):
+            parse_row("3, ,12,1,7,4,5, ,", 9)
+        for end in [[""], ["# a comment"], [self.line], []]:
+            with self.assertRaises(Exception):
+                list(read_puzzles(grid[:1] + end))
+        puzzles = list(read_puzzles(["quizzes,solutions"] + grid))
+        self.assertEqual(len(puzzles), 1)
+
+    def testUnknownLine(self):
+        with self.assertRaises(Exception):
+            list(read_puzzles(["12345"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+-------------------------------------------------------
+stats
+contains the Stats class that counts and times the moves
+of a Graph and the work of a Solver
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+import json
+
+# the counters kept for each technique
+FIELDS = ("invocations", "successes", "eliminations", "placements", "time")
+
+class Stats():
+    '''
+    Stats
+        the counters of the moves played and the propagation done
+        time is the wall time in seconds
+    '''
+    def __init__(self):
+        self.techniques = {}
+        # propagation passes, nodes queued and the longest queue
+        self.sweeps = 0
+        self.queued = 0
+        self.longest_queue = 0
+        self.guesses = 0
+        # the number of chains that removed a color by their length
+        self.chain_lengths = {}
+
+    def record(self, technique, success, eliminations, placements, elapsed):
+        '''
+        a method that records one invocation of a technique
+        Parameters:
+            technique: the name of the technique (str)
+            success: True if the technique made a move (boolean)
+            eliminations: the number of colors removed (int)
+            placements: the number of nodes colored (int)
+            elapsed: the wall time taken in seconds (float)
+        Returns:
+            None
+        '''
+        counters = self.techniques.get(technique)
+        if counters is None:
+            counters = dict.fromkeys(FIELDS, 0)
+            self.techniques[technique] = counters
+        counters["invocations"] += 1
+        if success:
+            counters["successes"] += 1
+        counters["eliminations"] += eliminations
+        counters["placements"] += placements
+        counters["time"] += elapsed
+
+    def record_queue(self, length):
+        '''
+        a method that records the length of the propagation queue
+        Parameters:
+            length: the number of queued nodes (int)
+        Returns:
+            None
+        '''
+        self.queued += length
+        if length > self.longest_queue:
+            self.longest_queue = length
+
+    def record_chain(self, length):
+        '''
+        a method that records a chain that removed a color
+        Parameters:
+            length: the number of nodes in the chain (int)
+        Returns:
+            None
+        '''
+        self.chain_lengths[length] = self.chain_lengths.get(length, 0) + 1
+
+    def merge(self, other):
+        '''
+        a method that adds the counters of other stats to these
+        Parameters:
+            other: the stats to add, a Stats or a dict from to_dict
+        Returns:
+            None
+        '''
+        if isinstance(other, Stats):
+            other = other.to_dict()
+        for technique, counters in other["techniques"].items():
+            mine = self.techniques.get(technique)
+            if mine is None:
+                mine = dict.fromkeys(FIELDS, 0)
+                self.techniques[technique] = mine
+            for field in FIELDS:
+                mine[field] += counters[field]
+        self.sweeps += other["sweeps"]
+        self.queued += other["queued"]
+        self.longest_queue = max(self.longest_queue, other["longest_queue"])
+        self.guesses += other["guesses"]
+        for length, count in other.get("chain_lengths", {}).items():
+            # json turns the lengths into strings
+            length = int(length)
+            self.chain_lengths[length] = (self.chain_lengths.get(length, 0)
+                                          + count)
+
+    def reset(self):
+        '''
+        a method that clears every counter
+        Parameters:
+            None
+        Returns:
+            None
+        '''
+        self.__init__()
+
+    def to_dict(self):
+        '''
+        a method that converts the stats to plain dicts
+        Parameters:
+            None
+        Returns:
+            : the counters (dict)
+        '''
+        return {"techniques": dict((technique, dict(counters))
+                                   for technique, counters
+                                   in self.techniques.items()),
+                "sweeps": self.sweeps,
+                "queued": self.queued,
+                "longest_queue": self.longest_queue,
+                "guesses": self.guesses,
+                "chain_lengths": dict(self.chain_lengths)}
+
+    def to_json(self):
+        '''
+        a method that dumps the stats as json
+        Parameters:
+            None
+        Returns:
+            : the counters as a json document (str)
+        '''
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    @staticmethod
+    def from_json(document):
+        '''
+        a function that loads stats dumped by to_json
+        Parameters:
+            document: the json document (str)
+        Returns:
+            stats: the loaded stats (Stats)
+        '''
+        stats = Stats()
+        stats.merge(json.loads(document))
+        return stats
+
+import unittest
+
+class StatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = Stats()
+        self.stats.record("obvious", True, 3, 1, 0.5)
+        self.stats.record("obvious", False, 0, 0, 0.25)
+        self.stats.record("two color", True, 2, 0, 1.0)
+        self.stats.record_queue(10)
+        self.stats.record_queue(4)
+        self.stats.record_chain(4)
+        self.stats.sweeps += 1
+
+    def tearDown(self):
+        pass
+
+    def testRecord(self):
+        self.assertEqual(self.stats.techniques["obvious"],
+                         {"invocations": 2, "successes": 1,
+                          "eliminations": 3, "placements": 1,
+                          "time": 0.75})
+        self.assertEqual(self.stats.queued, 14)
+        self.assertEqual(self.stats.longest_queue, 10)
+
+    def testMerge(self):
+        other = Stats()
+        other.record("obvious", True, 1, 1, 0.25)
+        other.record("three color", False, 0, 0, 0.5)
+        other.record_queue(12)
+        self.stats.merge(other)
+        self.stats.merge(other.to_dict())
+        self.assertEqual(self.stats.techniques["obvious"]["invocations"], 4)
+        self.assertEqual(self.stats.techniques["obvious"]["time"], 1.25)
+        self.assertEqual(self.stats.techniques["three color"]["successes"],
+                         0)
+        self.assertEqual(self.stats.longest_queue, 12)
+        self.assertEqual(self.stats.queued, 38)
+        other.record_chain(4)
+        other.record_chain(6)
+        self.stats.merge(other)
+        self.assertEqual(self.stats.chain_lengths, {4: 2, 6: 1})
+
+    def testJson(self):
+        loaded = Stats.from_json(self.stats.to_json())
+        self.assertEqual(loaded.to_dict(), self.stats.to_dict())
+        self.stats.reset()
+        self.assertEqual(self.stats.techniques, {})
+        self.assertEqual(self.stats.sweeps, 0)
+
+if __name__ == "__main__":
+    unittest.main()
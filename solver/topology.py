@@ -0,0 +1,262 @@
+"""
+-------------------------------------------------------
+topology
+contains the Topology class that describes the units
+and peers of a sudoku board, shared by all Graphs
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+# topologies are immutable so one is built per board geometry
+_TOPOLOGIES = {}
+
+def get_topology(n, box=None):
+    '''
+    a function that gets the shared topology for a board geometry
+    Parameters:
+        n: the size of the board (int)
+        box: the (rows, columns) shape of a box or None for
+              the default shape (tuple)
+    Returns:
+        topology: the topology of the board (Topology)
+    '''
+    if box is None:
+        box = default_box(n)
+    key = (n, box)
+    topology = _TOPOLOGIES.get(key)
+    if topology is None:
+        topology = Topology(n, box)
+        _TOPOLOGIES[key] = topology
+    return topology
+
+def default_box(n):
+    '''
+    a function that gets the default box shape for a board, the
+    most square k by m shape with k * m = n and k <= m, so 9 has
+    3 by 3 boxes, 6 has 2 by 3 boxes and 12 has 3 by 4 boxes
+    Parameters:
+        n: the size of the board (int)
+    Returns:
+        : the (rows, columns) shape of a box or False if the board
+          has no boxes (a prime size) (tuple)
+    '''
+    rows = int(n ** 0.5)
+    while rows > 1 and n % rows != 0:
+        rows -= 1
+    if rows <= 1:
+        return False
+    return (rows, n // rows)
+
+class Topology():
+    '''
+    Topology
+        the immutable units (rows, columns and boxes) and peers
+        of a sudoku board
+        units are numbered rows first, then columns, then boxes
+    '''
+    def __init__(self, n, box=False):
+        '''
+        constructor
+            builds the topology of a n by n board
+            Parameters:
+                n: the size of the board (int)
+                box: the (rows, columns) shape of a box or False
+                     if the board has no boxes (tuple)
+        '''
+        self.n = n
+        self.size = n * n
+        self.box = box
+        self.row_of = tuple(node_id // n for node_id in range(self.size))
+        self.column_of = tuple(node_id % n for node_id in range(self.size))
+        units = []
+        for row in range(n):
+            units.append(tuple(row * n + column for column in range(n)))
+        for column in range(n):
+            units.append(tuple(row * n + column for row in range(n)))
+        box_of = [None] * self.size
+        if box:
+            box_rows, box_columns = box
+            if box_rows * box_columns != n:
+                raise Exception("Box shape does not fit the board")
+            for row in range(0, n, box_rows):
+                for column in range(0, n, box_columns):
+                    unit = []
+                    for r in range(row, row + box_rows):
+                        for c in range(column, column + box_columns):
+                            unit.append(r * n + c)
+                            box_of[r * n + c] = len(units)
+                    units.append(tuple(unit))
+        self.units = tuple(units)
+        self.box_of = tuple(box_of)
+        cell_units = []
+        cell_bits = []
+        peers = []
+        row_peers = []
+        column_peers = []
+        box_peers = []
+        for node_id in range(self.size):
+            row = self.row_of[node_id]
+            column = self.column_of[node_id]
+            unit_ids = [row, n + column]
+            if box_of[node_id] is not None:
+                unit_ids.append(box_of[node_id])
+            cell_units.append(tuple(unit_ids))
+            # bit x is the x-th node of the unit
+            cell_bits.append(tuple(1 << units[unit_id].index(node_id)
+                                   for unit_id in unit_ids))
+            row_peers.append(tuple(x for x in units[row] if x != node_id))
+            column_peers.append(tuple(x for x in units[n + column]
+                                      if x != node_id))
+            if box_of[node_id] is not None:
+                box_peers.append(tuple(x for x in units[box_of[node_id]]
+                                       if x != node_id))
+            else:
+                box_peers.append(())
+            together = set()
+            for unit_id in unit_ids:
+                together.update(units[unit_id])
+            together.discard(node_id)
+            peers.append(tuple(sorted(together)))
+        self.cell_units = tuple(cell_units)
+        self.cell_bits = tuple(cell_bits)
+        # the nodes a line (row or column) shares with a box, as
+        # (line_id, box_id, line_mask, box_mask) where the masks are
+        # the positions of the shared nodes in each unit
+        intersections = []
+        cell_intersections = [[] for __ in range(self.size)]
+        for line_id in range(2 * n if box else 0):
+            by_box = {}
+            for node_id in units[line_id]:
+                by_box.setdefault(box_of[node_id], []).append(node_id)
+            for box_id, shared in sorted(by_box.items()):
+                line_mask = 0
+                box_mask = 0
+                for node_id in shared:
+                    line_mask |= 1 << units[line_id].index(node_id)
+                    box_mask |= 1 << units[box_id].index(node_id)
+                intersection = (line_id, box_id, line_mask, box_mask)
+                intersections.append(intersection)
+                for node_id in shared:
+                    cell_intersections[node_id].append(intersection)
+        self.intersections = tuple(intersections)
+        self.cell_intersections = tuple(tuple(x)
+                                        for x in cell_intersections)
+        self.peers = tuple(peers)
+        # the peers again for fast membership tests
+        self.peer_sets = tuple(frozenset(x) for x in peers)
+        self.row_peers = tuple(row_peers)
+        self.column_peers = tuple(column_peers)
+        self.box_peers = tuple(box_peers)
+
+    def is_row(self, unit_id):
+        '''
+        a method that checks if a unit is a row
+        Parameters:
+            unit_id: the unit id (int)
+        Returns:
+            True if the unit is a row
+            False otherwise
+        '''
+        return unit_id < self.n
+
+    def is_column(self, unit_id):
+        '''
+        a method that checks if a unit is a column
+        Parameters:
+            unit_id: the unit id (int)
+        Returns:
+            True if the unit is a column
+            False otherwise
+        '''
+        return self.n <= unit_id < 2 * self.n
+
+    def is_box(self, unit_id):
+        '''
+        a method that checks if a unit is a box
+        Parameters:
+            unit_id: the unit id (int)
+        Returns:
+            True if the unit is a box
+            False otherwise
+        '''
+        return unit_id >= 2 * self.n
+
+import unittest
+
+class TopologyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.topology = get_topology(9)
+
+    def tearDown(self):
+        pass
+
+    def testShared(self):
+        self.assertIs(get_topology(9), self.topology)
+        self.assertIs(get_topology(9, (3, 3)), self.topology)
+        self.assertIsNot(get_topology(3), self.topology)
+
+    def testUnits(self):
+        self.assertEqual(len(self.topology.units), 27)
+        self.assertEqual(self.topology.units[1], tuple(range(9, 18)))
+        self.assertEqual(self.topology.units[9],
+                         (0, 9, 18, 27, 36, 45, 54, 63, 72))
+        self.assertEqual(self.topology.units[18],
+                         (0, 1, 2, 9, 10, 11, 18, 19, 20))
+        self.assertEqual(self.topology.cell_units[10], (1, 10, 18))
+        self.assertEqual(self.topology.cell_units[80], (8, 17, 26))
+        self.assertEqual(self.topology.cell_bits[10], (1 << 1, 1 << 1,
+                                                       1 << 4))
+        self.assertEqual(self.topology.is_row(8), True)
+        self.assertEqual(self.topology.is_column(9), True)
+        self.assertEqual(self.topology.is_box(18), True)
+
+    def testPeers(self):
+        for peers in self.topology.peers:
+            self.assertEqual(len(peers), 20)
+        self.assertEqual(self.topology.row_peers[0], tuple(range(1, 9)))
+        self.assertEqual(self.topology.box_peers[0],
+                         (1, 2, 9, 10, 11, 18, 19, 20))
+        self.assertEqual(0 in self.topology.peers[0], False)
+        self.assertEqual(self.topology.peer_sets[0],
+                         frozenset(self.topology.peers[0]))
+
+    def testNoBoxes(self):
+        topology = get_topology(3)
+        self.assertEqual(len(topology.units), 6)
+        self.assertEqual(topology.peers[0], (1, 2, 3, 6))
+        self.assertEqual(topology.box_peers[0], ())
+        self.assertEqual(topology.cell_units[4], (1, 4))
+
+    def testIntersections(self):
+        self.assertEqual(len(self.topology.intersections), 54)
+        self.assertEqual(self.topology.cell_intersections[10],
+                         ((1, 18, 0b111, 0b111000),
+                          (10, 18, 0b111, 0b010010010)))
+        self.assertEqual(get_topology(3).intersections, ())
+        # boxes of two rows by three columns
+        topology = Topology(6, (2, 3))
+        self.assertEqual(len(topology.intersections), 6 * 2 + 6 * 3)
+        self.assertEqual(topology.cell_intersections[7],
+                         ((1, 12, 0b111, 0b111000),
+                          (7, 12, 0b11, 0b010010)))
+
+    def testDefaultBox(self):
+        self.assertEqual(default_box(9), (3, 3))
+        self.assertEqual(default_box(4), (2, 2))
+        self.assertEqual(default_box(6), (2, 3))
+        self.assertEqual(default_box(12), (3, 4))
+        self.assertEqual(default_box(16), (4, 4))
+        self.assertEqual(default_box(25), (5, 5))
+        self.assertEqual(default_box(7), False)
+        topology = get_topology(25)
+        self.assertEqual(len(topology.units), 75)
+        for peers in topology.peers:
+            self.assertEqual(len(peers), 24 * 3 - 4 * 2)
+
+    def testInvalidBox(self):
+        with self.assertRaises(Exception):
+            Topology(9, (2, 3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+-------------------------------------------------------
+trace
+the events a Graph emits while solving and sinks to send them to
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+from collections import namedtuple
+import logging
+
+# the kinds of events
+PLACE = "place"
+ELIMINATE = "eliminate"
+
+# cell is the (row, column) of the node, technique the move that
+# caused the event (None outside of a move) and colors the colors
+# placed or eliminated
+Event = namedtuple("Event", ["kind", "cell", "technique", "colors"])
+
+class ListSink():
+    '''
+    ListSink
+        a trace sink that keeps every event
+    '''
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+class LoggingSink():
+    '''
+    LoggingSink
+        a trace sink that writes every event to a logger
+    '''
+    def __init__(self, logger=None, level=logging.DEBUG):
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, event):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s (%d, %d) %s: %s", event.kind,
+                            event.cell[0], event.cell[1], event.technique,
+                            ",".join(str(color) for color in event.colors))
+
+import unittest
+
+class SinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.event = Event(ELIMINATE, (1, 2), "two color", [3, 5])
+
+    def tearDown(self):
+        pass
+
+    def testListSink(self):
+        sink = ListSink()
+        sink(self.event)
+        self.assertEqual(sink.events, [self.event])
+
+    def testLoggingSink(self):
+        logger = logging.getLogger("solver.trace.test")
+        logger.setLevel(logging.DEBUG)
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            LoggingSink(logger)(self.event)
+        self.assertEqual(logs.output,
+                         ["DEBUG:solver.trace.test:eliminate (1, 2) "
+                          "two color: 3,5"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+"""
+-------------------------------------------------------
+vectorized
+contains the BoardBatch class that applies naked and hidden
+singles to many boards at once with numpy
+-------------------------------------------------------
+Version: 2026-10-18
+-------------------------------------------------------
+"""
+try:
+    import numpy as np
+except ImportError:
+    # numpy is only needed by the batch engine
+    np = None
+from solver import Solver, SOLVED, UNSOLVABLE, GRAPH
+from solver.topology import get_topology
+import logging
+
+def solve_boards(grids, n=9, engine=GRAPH, budget=None, logger=None,
+                 box=None):
+    '''
+    a function that solves many boards, the singles are applied to
+    every board at once and the boards they do not finish are given
+    to a Solver
+    Parameters:
+        grids: the boards, each a list of rows (see Solver.load_list)
+        n: the size of the boards (int)
+        engine: the search engine for the unfinished boards (str)
+        budget: the most guesses for one unfinished board (int)
+        logger: the logger of the Solver (logging.Logger)
+        box: the (rows, columns) shape of a box, None for the
+             default shape (see topology.default_box) (tuple)
+    Returns:
+        results: a (status, grid) for each board in order (list)
+    '''
+    boards = BoardBatch(grids, n, box)
+    boards.propagate()
+    solved = boards.get_solved()
+    invalid = boards.invalid
+    results = []
+    solver = None
+    for index, grid in enumerate(boards.to_lists()):
+        if solved[index]:
+            results.append((SOLVED, grid))
+        elif invalid[index]:
+            results.append((UNSOLVABLE, grid))
+        else:
+            if solver is None:
+                solver = Solver(logger=logger, engine=engine, n=n, box=box)
+            solver.reset()
+            solver.load_list(grid)
+            status = solver.search(budget=budget)
+            results.append((status, solver.graph.to_list()))
+    return results
+
+class BoardBatch():
+    '''
+    BoardBatch
+        many boards of the same size held as (boards, nodes) arrays
+        of colors and palette bitmasks
+    '''
+    def __init__(self, grids, n=9, box=None):
+        '''
+        constructor
+            loads the boards
+            Parameters:
+                grids: the boards, each a list of rows
+                       (see Solver.load_list)
+                n: the size of the boards (int)
+                box: the (rows, columns) shape of a box, None for the
+                     default shape (tuple)
+            Raises:
+                Exception: if numpy is not installed
+        '''
+        if np is None:
+            raise Exception("numpy is required for BoardBatch")
+        topology = get_topology(n, box)
+        self.n = n
+        self.full = (1 << n) - 1
+        if n <= 16:
+            self.dtype = np.uint16
+        else:
+            self.dtype = np.uint32
+        # the same units Graph reasons about, as index arrays
+        self.units = np.array(topology.units, dtype=np.intp)
+        self.cell_units = np.array(topology.cell_units, dtype=np.intp)
+        self.colors = np.full((len(grids), topology.size), -1, dtype=np.int8)
+        for index, grid in enumerate(grids):
+            for row, colors in enumerate(grid):
+                for column, color in enumerate(colors):
+                    if color is not None and color != " ":
+                        self.colors[index, row * n + column] = color
+        self.invalid = np.zeros(len(grids), dtype=bool)
+        self.masks = None
+        self.update()
+
+    def update(self):
+        '''
+        a method that works out the palettes from the colors and
+        marks the boards that can not be solved
+        Parameters:
+            None
+        Returns:
+            None
+        '''
+        colored = self.colors >= 0
+        bits = np.where(colored,
+                        np.left_shift(1, self.colors.clip(0).astype(self.dtype)),
+                        0).astype(self.dtype)
+        # the colors used in each unit then the colors seen by each node
+        used = np.bitwise_or.reduce(bits[:, self.units], axis=2)
+        seen = np.bitwise_or.reduce(used[:, self.cell_units], axis=2)
+        self.masks = np.where(colored, 0, self.full & ~seen).astype(self.dtype)
+        # a unit repeats a color, a node has no color left or a unit
+        # has no place left for a color
+        repeated = (colored[:, self.units].sum(axis=2) !=
+                    self.count_colors(used)).any(axis=1)
+        empty = (~colored & (self.masks == 0)).any(axis=1)
+        cover = np.bitwise_or.reduce((self.masks | bits)[:, self.units],
+                                     axis=2)
+        missing = (cover != self.full).any(axis=1)
+        self.invalid |= repeated | empty | missing
+
+    def count_colors(self, masks):
+        '''
+        a method that counts the colors of an array of bitmasks
+        Parameters:
+            masks: the bitmasks (numpy.ndarray)
+        Returns:
+            counts: the number of colors in each mask (numpy.ndarray)
+        '''
+        counts = np.zeros(masks.shape, dtype=np.int16)
+        for color in range(self.n):
+            counts += (masks >> color) & 1
+        return counts
+
+    def propagate(self):
+        '''
+        a method that applies naked and hidden singles to every board
+        until none of them changes
+        Parameters:
+            None
+        Returns:
+            rounds: the number of rounds that colored a node (int)
+        '''
+        units = self.units
+        rounds = 0
+        while True:
+            active = ~self.invalid[:, None]
+            masks = self.masks
+            found = np.full(self.colors.shape, -1, dtype=np.int8)
+            # naked singles
+            for color in range(self.n):
+                found[active & (masks == (1 << color))] = color
+            # hidden singles
+            for color in range(self.n):
+                has = ((masks >> color) & 1).astype(bool)[:, units]
+                boards, unit_ids = np.nonzero(active &
+                                              (has.sum(axis=2) == 1))
+                if len(boards) > 0:
+                    positions = has[boards, unit_ids].argmax(axis=1)
+                    found[boards, units[unit_ids, positions]] = color
+            moves = found >= 0
+            if not moves.any():
+                break
+            self.colors = np.where(moves, found, self.colors)
+            self.update()
+            rounds += 1
+        return rounds
+
+    def get_solved(self):
+        '''
+        a method that finds the solved boards
+        Parameters:
+            None
+        Returns:
+            : True for each board that is solved (numpy.ndarray)
+        '''
+        return (self.colors >= 0).all(axis=1) & ~self.invalid
+
+    def to_lists(self):
+        '''
+        a method that converts the boards to lists of rows
+        Parameters:
+            None
+        Returns:
+            grids: the boards in the Graph.to_list format (list)
+        '''
+        grids = []
+        n = self.n
+        for colors in self.colors.tolist():
+            grid = []
+            for row in range(n):
+                grid.append([color if color >= 0 else " "
+                             for color in colors[row * n:(row + 1) * n]])
+            grids.append(grid)
+        return grids
+
+import unittest
+import os
+from solver import DLX
+
+@unittest.skipIf(np is None, "numpy not installed")
+class BoardBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.WARNING)
+        test_directory = os.path.dirname(os.getcwd())
+        self.grids = []
+        for name in ["test.txt", "test2.txt", "test3.txt"]:
+            solver = Solver(logger=self.logger)
+            solver.load(os.path.join(test_directory, "tests", name))
+            self.grids.append(solver.graph.to_list())
+        # a puzzle the singles alone can not finish
+        hard = ("8........" "..36....." ".7..9.2.." ".5...7..."
+                "....457.." "...1...3." "..1....68" "..85...1."
+                ".9....4..")
+        self.grids.append([[int(x) - 1 if x != "." else " "
+                            for x in hard[row * 9:(row + 1) * 9]]
+                           for row in range(9)])
+        # two 0 colors in the first row
+        invalid = [[" "] * 9 for __ in range(9)]
+        invalid[0][0] = 0
+        invalid[0][8] = 0
+        self.grids.append(invalid)
+
+    def tearDown(self):
+        pass
+
+    def check(self, grid):
+        solver = Solver(logger=self.logger)
+        solver.load_list(grid)
+        self.assertEqual(solver.graph.is_solved(), True)
+        self.assertEqual(solver.graph.validate(), True)
+
+    def testPropagate(self):
+        boards = BoardBatch(self.grids)
+        self.assertEqual(boards.propagate() > 0, True)
+        solved = boards.get_solved().tolist()
+        self.assertEqual(solved, [True, True, True, False, False])
+        self.assertEqual(boards.invalid.tolist(),
+                         [False, False, False, False, True])
+        grids = boards.to_lists()
+        for grid in grids[:3]:
+            self.check(grid)
+        expect = Solver(logger=self.logger)
+        expect.load(os.path.join(os.path.dirname(os.getcwd()),
+                                 "tests", "test.txt"))
+        expect.search()
+        self.assertEqual(grids[0], expect.graph.to_list())
+
+    def testPalettes(self):
+        boards = BoardBatch(self.grids[:1])
+        solver = Solver(logger=self.logger)
+        solver.load_list(self.grids[0])
+        for node_id in range(81):
+            row, column = solver.graph.get_row_column(node_id)
+            self.assertEqual(int(boards.masks[0, node_id]),
+                             solver.graph.get_available_mask(row, column))
+
+    def testSolveBoards(self):
+        results = solve_boards(self.grids, logger=self.logger, engine=DLX)
+        statuses = [status for status, grid in results]
+        self.assertEqual(statuses, [SOLVED] * 4 + [UNSOLVABLE])
+        for status, grid in results[:4]:
+            self.check(grid)
+
+if __name__ == "__main__":
+    unittest.main()